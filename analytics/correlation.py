@@ -0,0 +1,110 @@
+"""Correlations between two sets of columns.
+
+`DataFrame.corr` correlates every numeric column with every other, which grows with the square of
+the number of columns. The charts only need some columns against some others, so `block_corr`
+computes just that block with a few matrix products. Like `DataFrame.corr`, each pair of columns
+uses the rows where both have a value.
+"""
+
+import numpy as np
+import pandas as pd
+
+_CONSTANT_TOLERANCE = 1e-12
+
+
+def _values(df: pd.DataFrame, columns) -> np.ndarray:
+    """The columns as floats. Like in `DataFrame.corr`, infinite values count as missing."""
+    values = df[list(columns)].to_numpy(dtype="float64", na_value=np.nan)
+    return np.where(np.isfinite(values), values, np.nan)
+
+
+def _column_means(values: np.ndarray) -> np.ndarray:
+    """The mean of every column, ignoring `NaN`s. Columns without values get 0."""
+    valid = ~np.isnan(values)
+    counts = valid.sum(axis=0)
+    sums = np.where(valid, values, 0.0).sum(axis=0)
+    return np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+
+
+def block_corr(
+    df: pd.DataFrame, rows: [str], columns: [str], min_periods: int = 1
+) -> pd.DataFrame:
+    """The Pearson correlation of every column in `rows` with every column in `columns`.
+
+    The result equals `df.corr(min_periods=min_periods).loc[rows, columns]`, up to floating point
+    rounding.
+
+    Args:
+        min_periods (int): The fewest rows both columns of a pair need values in. Pairs with fewer
+            get `NaN`.
+    """
+    x = _values(df, rows)
+    y = _values(df, columns)
+    # Centering first keeps the sums small, so subtracting them below loses little precision.
+    x = x - _column_means(x)
+    y = y - _column_means(y)
+    x_valid = ~np.isnan(x)
+    y_valid = ~np.isnan(y)
+    x = np.where(x_valid, x, 0.0)
+    y = np.where(y_valid, y, 0.0)
+    x_valid = x_valid.astype("float64")
+    y_valid = y_valid.astype("float64")
+
+    count = x_valid.T @ y_valid
+    sum_x = x.T @ y_valid
+    sum_y = x_valid.T @ y
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = x.T @ y - sum_x * sum_y / count
+        squares_x = (x * x).T @ y_valid
+        squares_y = x_valid.T @ (y * y)
+        var_x = squares_x - sum_x * sum_x / count
+        var_y = squares_y - sum_y * sum_y / count
+        # A column that is constant over the rows of a pair has no correlation, even when
+        # rounding leaves a tiny variance.
+        var_x[var_x <= _CONSTANT_TOLERANCE * squares_x] = 0.0
+        var_y[var_y <= _CONSTANT_TOLERANCE * squares_y] = 0.0
+        divisor = np.sqrt(var_x * var_y)
+        corr = np.where(divisor > 0, cov / divisor, np.nan)
+    corr = np.clip(corr, -1.0, 1.0)
+    corr[count < max(min_periods, 1)] = np.nan
+    return pd.DataFrame(corr, index=list(rows), columns=list(columns))
+
+
+def grouped_block_corr(
+    df: pd.DataFrame, by: str, rows: [str], columns: [str], min_periods: int = 1
+) -> pd.DataFrame:
+    """`block_corr` computed separately for every group, like every unit.
+
+    Returns:
+        pd.DataFrame: The blocks stacked, indexed by the group and then the row column.
+    """
+    blocks = {
+        group: block_corr(subset, rows, columns, min_periods)
+        for group, subset in df.groupby(by, sort=False, observed=True)
+    }
+    return pd.concat(blocks, names=[by, None])
+
+
+def rolling_block_corr(
+    df: pd.DataFrame,
+    rows: [str],
+    columns: [str],
+    window: int,
+    min_periods: int = 1,
+) -> pd.DataFrame:
+    """`block_corr` over a rolling window of quarters.
+
+    The block for a quarter uses the rows of that quarter and the `window - 1` quarters before it,
+    taken from the `year` and `quarter.num` columns.
+
+    Returns:
+        pd.DataFrame: The blocks stacked, indexed by the last quarter of each window, as its
+            `quarter` label, and then the row column.
+    """
+    index = (df["year"] * 4 + df["quarter.num"] - 1).to_numpy()
+    labels = dict(zip(index, df["quarter"].astype(str)))
+    blocks = {}
+    for end in sorted(set(index)):
+        in_window = (index > end - window) & (index <= end)
+        blocks[labels[end]] = block_corr(df[in_window], rows, columns, min_periods)
+    return pd.concat(blocks, names=["quarter", None])
@@ -0,0 +1,281 @@
+"""Render the report figures.
+
+`ShowRenderer` saves each figure as html and shows it as soon as it is built. `ParallelRenderer`
+only collects the figures while they are built and exports them all at the end in a pool of
+processes. Each worker process keeps its kaleido renderer running between figures, so the cost of
+starting it is paid once per worker instead of once per image. `DashboardRenderer` writes every
+figure into a single html page that loads plotly.js once.
+"""
+
+import html
+import json
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple
+
+import plotly.io as pio
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+from analytics.data import create_and_get_output_path
+
+_LOGGER = logging.getLogger(__name__)
+
+RENDER_ENGINE = "png"
+
+
+class FigureTiming(NamedTuple):
+    title: str
+    html_seconds: float
+    image_seconds: float
+
+    @property
+    def seconds(self) -> float:
+        return self.html_seconds + self.image_seconds
+
+
+class ShowRenderer:
+    """Save every figure as html and show it with `RENDER_ENGINE` right away."""
+
+    def __init__(self, render_engine: str = RENDER_ENGINE):
+        self.render_engine = render_engine
+        self.timings = []
+
+    def render(self, title: str, fig):
+        start = time.perf_counter()
+        fig.write_html(create_and_get_output_path(f"{title}.html"))
+        html_done = time.perf_counter()
+        fig.show(renderer=self.render_engine)
+        self.timings.append(
+            FigureTiming(title, html_done - start, time.perf_counter() - html_done)
+        )
+
+    def close(self) -> List[FigureTiming]:
+        timings, self.timings = self.timings, []
+        return timings
+
+
+class ParallelRenderer:
+    """Export every figure to html and a static image in a pool of processes.
+
+    Figures are not shown. The images are written next to the html files.
+    """
+
+    def __init__(self, max_workers: int = None, image_format: str = RENDER_ENGINE):
+        """
+        Args:
+            max_workers (int): The number of worker processes. Defaults to the number of CPUs.
+            image_format (str): The static image format kaleido exports, or `None` to only write
+                html.
+        """
+        self.max_workers = max_workers
+        self.image_format = image_format
+        self._jobs = []
+
+    def render(self, title: str, fig):
+        """Queue `fig` for export. Only its plain figure spec is kept."""
+        self._jobs.append((title, fig.to_plotly_json()))
+
+    def close(self) -> List[FigureTiming]:
+        """Export every queued figure.
+
+        Returns:
+            List[FigureTiming]: How long each figure took to export, in the order they were queued.
+
+        Raises:
+            ImportError: `image_format` is set but kaleido, which exports the images, is not
+                installed.
+        """
+        jobs, self._jobs = self._jobs, []
+        if not jobs:
+            return []
+        if self.image_format:
+            try:
+                import kaleido
+            except ImportError:
+                raise ImportError(
+                    f"Exporting {self.image_format} images requires kaleido. Install it or "
+                    "use image_format=None to only write html."
+                ) from None
+        jobs = [
+            (
+                title,
+                spec,
+                str(create_and_get_output_path(f"{title}.html")),
+                (
+                    str(create_and_get_output_path(f"{title}.{self.image_format}"))
+                    if self.image_format
+                    else None
+                ),
+            )
+            for title, spec in jobs
+        ]
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_start_worker,
+            initargs=(self.image_format,),
+        ) as executor:
+            timings = list(executor.map(_export, jobs))
+        for timing in timings:
+            _LOGGER.info(
+                f"Rendered {timing.title} in {timing.seconds:.2f}s "
+                f"(html {timing.html_seconds:.2f}s, image {timing.image_seconds:.2f}s)"
+            )
+        return timings
+
+
+def _start_worker(image_format: str):
+    """Start the kaleido renderer of a worker process once, before its first figure."""
+    if image_format:
+        # kaleido keeps its renderer subprocess alive after the first image.
+        pio.to_image({"data": [], "layout": {}}, format=image_format)
+
+
+def _export(job) -> FigureTiming:
+    title, spec, html_path, image_path = job
+    start = time.perf_counter()
+    pio.write_html(spec, html_path)
+    html_done = time.perf_counter()
+    if image_path:
+        pio.write_image(spec, image_path)
+    return FigureTiming(title, html_done - start, time.perf_counter() - html_done)
+
+
+_DASHBOARD_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{plotlyjs}
+<style>
+body {{ font-family: sans-serif; margin: 0 auto; max-width: 1400px; }}
+.figure {{ height: 800px; margin-bottom: 2em; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+{figures}
+<script>
+const shared = {shared};
+const figures = {specs};
+function resolve(value) {{
+  if (Array.isArray(value)) return value.map(resolve);
+  if (value === null || typeof value !== "object") return value;
+  if ("$shared" in value) return shared[value["$shared"]];
+  const resolved = {{}};
+  for (const key in value) resolved[key] = resolve(value[key]);
+  return resolved;
+}}
+figures.forEach((spec, i) => {{
+  const figure = resolve(spec);
+  Plotly.newPlot("figure-" + i, figure.data, figure.layout, {{responsive: true}});
+}});
+</script>
+</body>
+</html>
+"""
+
+
+class SharedValues:
+    """Stores every distinct value once and hands out references to it.
+
+    Repeated values, like the quarter axis that every per ward trace plots against, are written to
+    the dashboard once and referenced from every figure that uses them.
+    """
+
+    def __init__(self):
+        self.values = []
+        self._index = {}
+
+    def share(self, value) -> Dict[str, int]:
+        key = json.dumps(value, sort_keys=True)
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self.values)
+            self.values.append(value)
+        return {"$shared": index}
+
+    def share_arrays(self, value):
+        """`value` with every array, including plotly's encoded typed arrays, shared."""
+        if isinstance(value, list):
+            return self.share(value) if value else value
+        if isinstance(value, dict):
+            if "bdata" in value:
+                return self.share(value)
+            return {key: self.share_arrays(item) for key, item in value.items()}
+        return value
+
+
+class DashboardRenderer:
+    """Write every figure into one self-contained html page, without showing any of them.
+
+    plotly.js, the layout template and the data arrays repeated across figures are included only
+    once, so the page is a fraction of the size of one html file per figure.
+    """
+
+    def __init__(self, path, title: str = "Dashboard", include_plotlyjs=True):
+        """
+        Args:
+            path: The html file to write.
+            title (str): The heading of the page.
+            include_plotlyjs: `True` embeds plotly.js in the page so it works offline, `"cdn"`
+                loads it from the plotly CDN instead.
+        """
+        self.path = path
+        self.title = title
+        self.include_plotlyjs = include_plotlyjs
+        self._figures = []
+
+    def render(self, title: str, fig):
+        """Add `fig` to the page. Nothing is written until `close`."""
+        self._figures.append((title, fig.to_plotly_json()))
+
+    def _plotlyjs(self) -> str:
+        if self.include_plotlyjs == "cdn":
+            url = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+            return f'<script src="{url}" charset="utf-8"></script>'
+        return f'<script type="text/javascript">{get_plotlyjs()}</script>'
+
+    def close(self) -> List[FigureTiming]:
+        """Write the page.
+
+        Returns:
+            List[FigureTiming]: How long each figure took to serialize into the page.
+        """
+        figures, self._figures = self._figures, []
+        shared = SharedValues()
+        specs = []
+        timings = []
+        for title, spec in figures:
+            start = time.perf_counter()
+            spec = json.loads(pio.to_json(spec, validate=False))
+            layout = spec.get("layout", {})
+            if "template" in layout:
+                layout["template"] = shared.share(layout["template"])
+            specs.append(
+                {
+                    "data": [shared.share_arrays(trace) for trace in spec["data"]],
+                    "layout": layout,
+                }
+            )
+            timings.append(FigureTiming(title, time.perf_counter() - start, 0.0))
+        divs = "\n".join(
+            f'<h2>{html.escape(title)}</h2>\n<div id="figure-{i}" class="figure"></div>'
+            for i, (title, _) in enumerate(figures)
+        )
+        page = _DASHBOARD_TEMPLATE.format(
+            title=html.escape(self.title),
+            plotlyjs=self._plotlyjs(),
+            figures=divs,
+            shared=_script_json(shared.values),
+            specs=_script_json(specs),
+        )
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(page)
+        _LOGGER.info(f"Wrote {len(figures)} figures to {self.path}")
+        return timings
+
+
+def _script_json(value) -> str:
+    """`value` as JSON that is safe to put inside a script tag."""
+    return json.dumps(value, separators=(",", ":")).replace("</", "<\\/")
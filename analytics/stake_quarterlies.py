@@ -4,7 +4,11 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from analytics.correlation import block_corr
 from analytics.data import *
+from analytics.rendering import RENDER_ENGINE, FigureTiming, ShowRenderer
+from lcr.quarterly_report import QuarterlyReport
+from lcr.report_storage import read_quarterly_report, with_numpy_dtypes
 
 
 STANDARDS_2024 = {
@@ -23,8 +27,6 @@ STANDARDS_2024 = {
 In late 2023, the church released standards for unit sizes that would take effect in 2024. 
 The summary of these changes can be seen in on the [church newsroom](https://newsroom.churchofjesuschrist.org/article/first-presidency-announces-uniform-worldwide-standards-for-ward-and-stake-boundaries).
 This variable reflects what those new minimums are and is used when drawing min lines for reports."""
-RENDER_ENGINE = "png"
-
 
 DEFAULT_LDS_PALETTE = [
     "#007DA5",
@@ -49,12 +51,13 @@ def ward_standards_table_md():
     return header + "\n".join(rows)
 
 
-def __show_and_save_html_report(report_title: str, fig):
-    """Saves the html report"""
-    html_report_name = f"{report_title}.html"
-    fig.write_html(create_and_get_output_path(html_report_name))
-    # print(f"{report_title} - Saved.")
-    fig.show(renderer=RENDER_ENGINE)
+def __show_and_save_html_report(report_title: str, fig, renderer=None):
+    """Saves the html report
+
+    Args:
+        renderer: See `analytics.rendering`. Defaults to a `ShowRenderer`.
+    """
+    (renderer or ShowRenderer()).render(report_title, fig)
 
 
 def get_section_by_label(qrp, section_id):
@@ -73,11 +76,27 @@ def get_row_by_label(section, row_id):
 
 
 def get_value_for_field(qrp, section_id, row_id):
+    """The row id and actual value of a row.
+
+    A report response is scanned up to the row on every call. When looking up many rows of one
+    report, convert it to a `QuarterlyReport` once and pass that; it is a dict lookup.
+    """
+    if isinstance(qrp, QuarterlyReport):
+        return row_id, qrp.actual(section_id, row_id)
     section = get_section_by_label(qrp, section_id)
     row = get_row_by_label(section, row_id)
     return row_id, row["actualValue"]
 
 
+def get_values_for_fields(qrp, fields):
+    """The actual values of several `(section id, row id)` fields, by row id.
+
+    A report response is indexed once per call, so this is cheaper than `get_value_for_field` for
+    each field.
+    """
+    return QuarterlyReport.of(qrp).values(fields)
+
+
 def clean_legend_entry(entry: str) -> str:
     entry = (
         entry.replace("ward.", "")
@@ -88,47 +107,61 @@ def clean_legend_entry(entry: str) -> str:
     return entry
 
 
+def group_by_ward(df: pd.DataFrame):
+    """Partition `df` by `unitName` in one pass.
+
+    Returns:
+        [(str, pd.DataFrame)]: Every ward with its rows, in the order the wards first appear.
+    """
+    return [
+        (ward, subset)
+        for ward, subset in df.groupby("unitName", sort=False, observed=True)
+    ]
+
+
 def make_bar_chart_per_ward_in_grid(
     df: pd.DataFrame,
     min_line: int = None,
     title: str = "",
     plot_variable: [str] = None,
     color_scheme: [str] = DEFAULT_LDS_PALETTE,
+    renderer=None,
 ):
-    wards = df["unitName"].unique()
+    ward_groups = group_by_ward(df)
+    wards = [ward for ward, _ in ward_groups]
     grid_size = math.ceil(math.sqrt(len(wards)))
     fig = make_subplots(
         rows=grid_size, cols=grid_size, subplot_titles=wards, shared_yaxes="all"
     )
-    legend_added = set()
-    for i, ward in enumerate(wards):
+    names = {variable: clean_legend_entry(variable) for variable in plot_variable}
+    show_legends = len(plot_variable) > 1
+    traces, trace_rows, trace_cols = [], [], []
+    for i, (ward, subset) in enumerate(ward_groups):
         row = i // grid_size + 1
         col = i % grid_size + 1
-        subset = df[df["unitName"] == ward]
         for j, variable in enumerate(plot_variable):
-            show_legend = False
-            if (variable not in legend_added) and len(plot_variable) > 1:
-                show_legend = True
-                legend_added.add(variable)
-            fig.add_trace(
+            traces.append(
                 go.Bar(
                     x=subset["quarter"],
                     y=subset[variable],
-                    name=variable,
+                    name=names[variable],
                     marker_color=color_scheme[j],
-                    showlegend=show_legend,
+                    showlegend=show_legends and i == 0,
                     text=subset[variable],
                     textposition="auto",
-                ),
-                row=row,
-                col=col,
+                )
             )
-            fig.update_traces(
-                name=clean_legend_entry(variable), selector=dict(name=variable)
+            trace_rows.append(row)
+            trace_cols.append(col)
+    fig.add_traces(traces, rows=trace_rows, cols=trace_cols)
+    if min_line:
+        for i in range(len(wards)):
+            fig.add_hline(
+                y=min_line,
+                line_dash="dash",
+                row=i // grid_size + 1,
+                col=i % grid_size + 1,
             )
-
-        if min_line:
-            fig.add_hline(y=min_line, line_dash="dash", row=row, col=col)
     fig.update_layout(
         legend=dict(orientation="h", yanchor="bottom", y=-0.3, xanchor="center", x=0.5)
     )
@@ -139,17 +172,18 @@ def make_bar_chart_per_ward_in_grid(
         },
         barmode="stack",
     )
-    __show_and_save_html_report(title, fig)
+    __show_and_save_html_report(title, fig, renderer)
 
 
-def make_charts_colum_per_ward(df: pd.DataFrame, rows, title):
-    wards = df["unitName"].unique()
+def make_charts_colum_per_ward(df: pd.DataFrame, rows, title, renderer=None):
+    ward_groups = group_by_ward(df)
+    wards = [ward for ward, _ in ward_groups]
     fig = make_subplots(
         rows=len(rows), cols=len(wards), shared_yaxes=True, subplot_titles=wards
     )
     legend_added = {}
-    for column_index, ward in enumerate(wards, start=1):
-        ward_data = df[df["unitName"] == ward]
+    traces, trace_rows, trace_cols = [], [], []
+    for column_index, (ward, ward_data) in enumerate(ward_groups, start=1):
         for row_index, row in enumerate(rows, start=1):
             for variable in row["variables"]:
                 show_legend = False
@@ -157,19 +191,22 @@ def make_charts_colum_per_ward(df: pd.DataFrame, rows, title):
                     show_legend = True
                     entries = len(legend_added)
                     legend_added[variable] = entries
-                fig.add_trace(
+                traces.append(
                     go.Bar(
                         x=ward_data["quarter"],
                         y=ward_data[variable],
                         name=variable,
                         marker_color=px.colors.qualitative.D3[legend_added[variable]],
                         showlegend=show_legend,
-                    ),
-                    row=row_index,
-                    col=column_index,
+                    )
                 )
-            fig.update_yaxes(title_text=row["name"], row=row_index, col=1)
-            if "standard" in row.keys():
+                trace_rows.append(row_index)
+                trace_cols.append(column_index)
+    fig.add_traces(traces, rows=trace_rows, cols=trace_cols)
+    for row_index, row in enumerate(rows, start=1):
+        fig.update_yaxes(title_text=row["name"], row=row_index, col=1)
+        if "standard" in row.keys():
+            for column_index in range(1, len(wards) + 1):
                 fig.add_hline(
                     y=row["standard"], line_dash="dash", row=row_index, col=column_index
                 )
@@ -179,10 +216,10 @@ def make_charts_colum_per_ward(df: pd.DataFrame, rows, title):
             "text": title,
         },
     )
-    __show_and_save_html_report(title, fig)
+    __show_and_save_html_report(title, fig, renderer)
 
 
-def chart_melch_per_ward(df: pd.DataFrame):
+def chart_melch_per_ward(df: pd.DataFrame, renderer=None):
     df["melch.not.attending"] = df["adult.male.melch"] - df["melch.attending"]
     make_bar_chart_per_ward_in_grid(
         df,
@@ -190,73 +227,82 @@ def chart_melch_per_ward(df: pd.DataFrame):
         title="Melchizedek Priesthood Attendance",
         plot_variable=["melch.attending", "melch.not.attending"],
         color_scheme=ATTENDANCE_PALETTE,
+        renderer=renderer,
     )
 
 
-def chart_primary_per_ward(df: pd.DataFrame):
+def chart_primary_per_ward(df: pd.DataFrame, renderer=None):
     make_bar_chart_per_ward_in_grid(
         df,
         title="Primary Attendance",
         plot_variable=["children.attending.primary.2019.1"],
+        renderer=renderer,
     )
 
 
-def chart_membership_per_ward(df: pd.DataFrame):
+def chart_membership_per_ward(df: pd.DataFrame, renderer=None):
     make_bar_chart_per_ward_in_grid(
         df,
         title="Ward Membership",
         plot_variable=["total.members"],
         min_line=STANDARDS_2024["ward.membership"],
+        renderer=renderer,
     )
 
 
-def chart_adult_active_per_ward(df: pd.DataFrame):
+def chart_adult_active_per_ward(df: pd.DataFrame, renderer=None):
     make_bar_chart_per_ward_in_grid(
         df,
         title="Adults Attending Sunday Meetings",
         plot_variable=["melch.attending", "women.attending.meetings"],
         min_line=STANDARDS_2024["ward.participating.adults"],
+        renderer=renderer,
     )
 
 
-def chart_adult_temple_recommends_per_ward(df: pd.DataFrame):
+def chart_adult_temple_recommends_per_ward(df: pd.DataFrame, renderer=None):
     make_bar_chart_per_ward_in_grid(
         df,
         title="Adults with Temple Recommend",
         plot_variable=["endowed.adults.with.recommend"],
+        renderer=renderer,
     )
 
 
-def chart_youth_temple_recommends_per_ward(df: pd.DataFrame):
+def chart_youth_temple_recommends_per_ward(df: pd.DataFrame, renderer=None):
     make_bar_chart_per_ward_in_grid(
         df,
         title="Youth with Temple Recommend",
         plot_variable=["youth.with.recommend"],
+        renderer=renderer,
     )
 
 
-def chart_all_temple_recommends_per_ward(df: pd.DataFrame):
+def chart_all_temple_recommends_per_ward(df: pd.DataFrame, renderer=None):
     make_bar_chart_per_ward_in_grid(
         df,
         title="All Members with Temple Recommends",
         plot_variable=["endowed.adults.with.recommend", "youth.with.recommend"],
+        renderer=renderer,
     )
 
 
-def chart_sacrament_meeting_attendance_per_ward(df: pd.DataFrame):
+def chart_sacrament_meeting_attendance_per_ward(df: pd.DataFrame, renderer=None):
     make_bar_chart_per_ward_in_grid(
         df,
         title="Sacrament Meeting Attendance",
         plot_variable=["sacrament.attendance"],
+        renderer=renderer,
     )
 
 
-def chart_youth_active_per_ward(df: pd.DataFrame):
+def chart_youth_active_per_ward(df: pd.DataFrame, renderer=None):
     make_bar_chart_per_ward_in_grid(
         df,
         title="Participating Youth",
         plot_variable=["young.men.attending", "young.women.attending"],
         min_line=STANDARDS_2024["ward.participating.youth"],
+        renderer=renderer,
     )
 
 
@@ -307,7 +353,7 @@ def aggregate_attendance_and_percentages(df: pd.DataFrame):
     return df
 
 
-def chart_attendance_percent_trend(df: pd.DataFrame):
+def chart_attendance_percent_trend(df: pd.DataFrame, renderer=None):
     plots = [
         {
             "name": "Sacrament",
@@ -354,21 +400,24 @@ def chart_attendance_percent_trend(df: pd.DataFrame):
     )
     if len(df["unitName"].unique()) == 1:
         fig.update_layout(showlegend=False)
-    __show_and_save_html_report(title, fig)
+    __show_and_save_html_report(title, fig, renderer)
 
 
-def chart_correlations(df: pd.DataFrame):
-    corr_matrix = df.corr(numeric_only=True)
-    corr_matrix.dropna(axis=1, how="all", inplace=True)
-    corr_matrix.dropna(axis=0, how="all", inplace=True)
-    cols = [i for i in corr_matrix.columns if (not "attend" in i)]
+def chart_correlations(df: pd.DataFrame, renderer=None):
+    # Only the attendance percentages against the other metrics are charted, so only that block
+    # of the correlation matrix is computed. Columns without variance correlate with nothing.
+    numeric = [
+        column
+        for column in df.select_dtypes(include=["number", "bool"]).columns
+        if df[column].nunique() > 1
+    ]
+    cols = [i for i in numeric if (not "attend" in i)]
     rows = [
         i
-        for i in corr_matrix.index
+        for i in numeric
         if (not "potential" in i) and ("attend" in i) and ("percent" in i)
     ]
-    corr_matrix = corr_matrix[cols]
-    corr_matrix = corr_matrix.loc[rows]
+    corr_matrix = block_corr(df, rows, cols)
     corr_matrix.sort_index(inplace=True)
     corr_matrix.sort_index(axis=1, inplace=True)
     fig = px.imshow(
@@ -379,24 +428,47 @@ def chart_correlations(df: pd.DataFrame):
     )
     title = "Attendance Percentages Correlation to other metrics"
     fig.update_layout(title={"text": title})
-    __show_and_save_html_report(title, fig)
-
-
-def make_individual_charts(df: pd.DataFrame):
-    chart_melch_per_ward(df)
-    chart_primary_per_ward(df)
-    chart_membership_per_ward(df)
-    chart_adult_active_per_ward(df)
-    chart_youth_active_per_ward(df)
+    __show_and_save_html_report(title, fig, renderer)
+
+
+def make_individual_charts(df: pd.DataFrame, renderer=None):
+    chart_melch_per_ward(df, renderer)
+    chart_primary_per_ward(df, renderer)
+    chart_membership_per_ward(df, renderer)
+    chart_adult_active_per_ward(df, renderer)
+    chart_youth_active_per_ward(df, renderer)
+
+
+def create_quarterly_analytics(
+    data_file: str,
+    starting_year: int,
+    unit_name: str,
+    columns: [str] = None,
+    renderer=None,
+) -> [FigureTiming]:
+    """Create the quarterly report charts.
+
+    Args:
+        data_file (str): The quarterly report table. It can be csv, Parquet or Feather.
+        columns ([str]): Only load these report columns. All charts need the default, every column.
+        renderer: Renders the charts, see `analytics.rendering`. Defaults to showing each chart as
+            soon as it is built. A `ParallelRenderer` exports them all at the end instead.
+
+    Returns:
+        [FigureTiming]: How long rendering each chart took.
+    """
+    renderer = renderer or ShowRenderer()
+    __create_charts(data_file, starting_year, unit_name, columns, renderer)
+    return renderer.close()
 
 
-def create_quarterly_analytics(data_file: str, starting_year: int, unit_name: str):
-    df = pd.read_csv(data_file)
+def __create_charts(data_file, starting_year, unit_name, columns, renderer):
+    df = with_numpy_dtypes(read_quarterly_report(data_file, columns=columns))
     df = aggregate_attendance_and_percentages(df)
-    chart_correlations(df)
+    chart_correlations(df, renderer)
     df = df[df["year"] >= starting_year]
-    make_individual_charts(df)
-    chart_attendance_percent_trend(df)
+    make_individual_charts(df, renderer)
+    chart_attendance_percent_trend(df, renderer)
     rows = [
         {
             "name": "Membership",
@@ -427,4 +499,4 @@ def create_quarterly_analytics(data_file: str, starting_year: int, unit_name: st
             "variables": ["children.attending.primary.2019.1"],
         },
     ]
-    make_charts_colum_per_ward(df, rows, unit_name)
+    make_charts_colum_per_ward(df, rows, unit_name, renderer)
@@ -1,25 +1,48 @@
 import logging
-import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, Optional, Union
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as ec
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+import requests
 
-from lcr.quarter import Quarter
+from lcr.cache import make_key
+from lcr.metrics import HIT, MISS, RequestEvent
+from lcr.photos import PhotoStore
+from lcr.quarter import Quarter, quarter_is_closed
+from lcr.records import (
+    Calling,
+    Member,
+    Recommend,
+    iter_callings,
+    iter_records,
+    to_records,
+)
+from lcr.session import delete_session, load_session, save_session
+from lcr.singleflight import SingleFlight
+from lcr.streaming import CHUNK_SIZE, iter_json_array
+from lcr.transport import Transport
 from lcr.unit import Unit
 
 _LOGGER = logging.getLogger(__name__)
 HOST = "churchofjesuschrist.org"
 BETA_HOST = f"beta.{HOST}"
 LCR_DOMAIN = f"lcr.{HOST}"
-CHROME_OPTIONS = webdriver.chrome.options.Options()
-CHROME_OPTIONS.add_argument("--headless")
 
 TIMEOUT = 10
 
+MINISTERING_DISTRICTS = {"EQ": "elders", "RS": "reliefSociety"}
+"""The member of the ministering response holding the districts of each organization."""
+UNIT_ENDPOINTS = (
+    "member_list",
+    "members_alt",
+    "members_moved_in",
+    "members_moved_out",
+    "ministering",
+    "recommend_status",
+)
+"""The methods of `API` that take a `unit_number` and can be fetched with `API.for_units`."""
+
 
 if _LOGGER.getEffectiveLevel() <= logging.DEBUG:
     import http.client as http_client
@@ -27,26 +50,142 @@ if _LOGGER.getEffectiveLevel() <= logging.DEBUG:
     http_client.HTTPConnection.debuglevel = 1
 
 
+def chrome_options():
+    """The options used to start Chrome for the browser login.
+
+    Selenium is only imported once a browser login is needed, so code that never logs in through
+    the browser does not require it to be installed.
+    """
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument("--headless")
+    return options
+
+
+def __getattr__(name):
+    # `CHROME_OPTIONS` used to be built when this module was imported.
+    if name == "CHROME_OPTIONS":
+        return chrome_options()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 class InvalidCredentialsError(Exception):
     pass
 
 
+def _is_json(response) -> bool:
+    try:
+        response.json()
+    except ValueError:
+        return False
+    return True
+
+
 class API:
-    def __init__(self, username, password, unit_number, beta=False, driver=None):
+    def __init__(
+        self,
+        username,
+        password,
+        unit_number,
+        beta=False,
+        driver=None,
+        cache=None,
+        session_file=None,
+        chrome_driver_path=None,
+        cookies=None,
+        transport=None,
+        hooks=None,
+    ):
+        """
+        Args:
+            driver: The selenium driver to log in with. Chrome is only started when a browser
+                login is needed and no driver was given.
+            cache (lcr.cache.ResponseCache): An optional persistent cache for responses of slow
+                changing endpoints.
+            session_file: An optional file to save the login cookies to. If it holds a session that
+                is still valid, that session is reused and the browser login is skipped.
+            chrome_driver_path (str): The ChromeDriver to start Chrome with. When not given,
+                ChromeDriver is installed automatically.
+            cookies (Dict[str, str]): Already authenticated `appSession` cookies. When given, no
+                login happens at all and `username` and `password` are not used.
+            transport (lcr.transport.Transport): How requests are sent: the connection pool size,
+                retries and rate limit. Share one transport between several `API`s to share its
+                rate limit.
+            hooks (List[Callable]): Called with a `lcr.metrics.RequestEvent` after every request,
+                from the thread that made it. See `lcr.metrics.RequestMetrics`.
+        """
         self.unit_number = unit_number
+        self.cache = cache
         self.session = requests.Session()
-        if not driver:
-            driver = webdriver.Chrome(
-                service=Service(ChromeDriverManager().install()), options=CHROME_OPTIONS
-            )
+        self.transport = transport or Transport()
+        self.transport.mount(self.session)
         self.driver = driver
         self.beta = beta
         self.host = BETA_HOST if beta else HOST
-
-        self._login(username, password)
+        self.session_file = session_file
+        self.chrome_driver_path = chrome_driver_path
+        self.hooks = list(hooks or [])
+        self._in_flight = SingleFlight()
+        self._cache_hits = 0
+        self._stats_lock = threading.Lock()
+
+        if cookies is not None:
+            for name, value in cookies.items():
+                self.session.cookies[name] = value
+        elif not (session_file and self._restore_session(session_file)):
+            self._login(username, password)
+
+    @classmethod
+    def from_cookies(cls, cookies, unit_number, **kwargs):
+        """Create an `API` from already authenticated cookies without logging in.
+
+        This never imports selenium.
+        """
+        return cls(None, None, unit_number, cookies=cookies, **kwargs)
+
+    def _restore_session(self, session_file) -> bool:
+        """Load the cookies saved in `session_file` and check that LCR still accepts them."""
+        cookies = load_session(session_file)
+        if not cookies:
+            return False
+        for name, value in cookies.items():
+            self.session.cookies[name] = value
+        if self._session_is_valid():
+            _LOGGER.info(f"Reusing session from {session_file}")
+            return True
+        _LOGGER.info(f"Saved session in {session_file} is no longer valid")
+        self.session.cookies.clear()
+        delete_session(session_file)
+        return False
+
+    def _session_is_valid(self) -> bool:
+        """Make one cheap, uncached request to check that the session is authenticated.
+
+        An expired session is redirected to the login page, so anything other than a json
+        response counts as invalid.
+        """
+        request = {
+            "url": "https://{}/services/access-table".format(LCR_DOMAIN),
+            "params": {"lang": "eng"},
+            "allow_redirects": False,
+            "timeout": TIMEOUT,
+        }
+        try:
+            response = self._make_request(request, endpoint="session_check")
+            response.json()
+        except (requests.RequestException, ValueError):
+            return False
+        return response.status_code == 200
 
     def _login(self, user, password):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as ec
+
         _LOGGER.info("Logging in")
+        if not self.driver:
+            self.driver = self._start_chrome()
 
         # Navigate to the login page
         self.driver.get(f"https://{LCR_DOMAIN}")
@@ -73,24 +212,138 @@ class API:
 
         # Get authState parameter.
         cookies = self.driver.get_cookies()
+        session_cookies = []
         for c in cookies:
             if "appSession" in c["name"]:
                 self.session.cookies[c["name"]] = c["value"]
+                session_cookies.append(c)
 
         self.driver.close()
         self.driver.quit()
 
-    def _make_request(self, request):
+        if self.session_file:
+            save_session(self.session_file, session_cookies)
+
+    def _start_chrome(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        driver_path = self.chrome_driver_path
+        if not driver_path:
+            from webdriver_manager.chrome import ChromeDriverManager
+
+            driver_path = ChromeDriverManager().install()
+        return webdriver.Chrome(service=Service(driver_path), options=chrome_options())
+
+    def _make_request(self, request, endpoint=None, immutable=False, parse_json=False):
+        """
+        Identical requests made at the same time from several threads are sent once: the
+        first one is made and the others wait for it and get the same response, or with
+        `parse_json` the same parsed object. Streamed requests are never coalesced, since their
+        body can only be read once.
+
+        Args:
+            request (dict): The keyword arguments for `requests.Session.get`.
+            endpoint (str): The name of the API method making the request. It picks the cache time
+                to live and names the request for the transport. Requests without an endpoint are
+                never cached.
+            immutable (bool): The response can never change, so it is cached without expiry.
+            parse_json (bool): Return the parsed JSON body instead of the response.
+        """
         if self.beta:
             request["cookies"] = {
                 "clerk-resources-beta-terms": "4.1",
                 "clerk-resources-beta-eula": "4.2",
             }
 
-        response = self.session.get(**request)
+        if request.get("stream"):
+            return self._fetch(request, endpoint, immutable, parse_json)
+
+        def fetch():
+            return self._fetch(request, endpoint, immutable, parse_json)
+
+        key = (endpoint, make_key(request["url"], request.get("params")), parse_json)
+        return self._in_flight.do(key, fetch)
+
+    def _fetch(self, request, endpoint, immutable, parse_json=False):
+        """Send a request through the cache and the transport.
+
+        Only responses that were not redirected and hold JSON are cached. An expired session is
+        redirected to the login page, which must not be stored in place of the data.
+        """
+        use_cache = endpoint is not None and self.cache and self.cache.caches(endpoint)
+        start = time.perf_counter()
+        if use_cache:
+            key = make_key(request["url"], request.get("params"), self.host)
+            cached = self.cache.get(key)
+            if cached is not None:
+                with self._stats_lock:
+                    self._cache_hits += 1
+                self._emit(request, endpoint, start, cached, cache=HIT)
+                return cached.json() if parse_json else cached
+
+        cache_status = MISS if use_cache else None
+        try:
+            response = self.transport.get(self.session, request, endpoint=endpoint)
+        except requests.RequestException as e:
+            self._emit(request, endpoint, start, None, cache=cache_status, error=e)
+            raise
+        self._emit(request, endpoint, start, response, cache=cache_status)
         response.raise_for_status()  # break on any non 200 status
+        if parse_json:
+            result = response.json()
+            if use_cache and not response.history:
+                self.cache.set(key, endpoint, response, immutable=immutable)
+            return result
+        if use_cache and not response.history and _is_json(response):
+            self.cache.set(key, endpoint, response, immutable=immutable)
         return response
 
+    def request_stats(self) -> Dict[str, int]:
+        """Counts of the requests made through this api.
+
+        Returns:
+            Dict[str, int]: `calls` is the number of requests that were not coalesced, `coalesced`
+                the number that shared the result of an identical request already in flight and
+                `cache_hits` the number answered from the response cache. Streamed requests are
+                never coalesced and only count towards `cache_hits`.
+        """
+        stats = self._in_flight.stats()
+        with self._stats_lock:
+            stats["cache_hits"] = self._cache_hits
+        return stats
+
+    def _emit(self, request, endpoint, start, response, cache=None, error=None):
+        """Call the hooks with the `RequestEvent` of a finished request."""
+        if not self.hooks:
+            return
+        latency = time.perf_counter() - start
+        status = size = None
+        retries = 0
+        if response is not None:
+            status = response.status_code
+            retries = getattr(response, "retries", 0)
+            if request.get("stream") and cache != HIT:
+                length = response.headers.get("Content-Length")
+                size = int(length) if length and length.isdigit() else None
+            else:
+                size = len(response.content)
+        event = RequestEvent(
+            endpoint,
+            request["url"],
+            status,
+            latency,
+            bytes=size,
+            retries=retries,
+            cache=cache,
+            error=type(error).__name__ if error is not None else None,
+        )
+        for hook in self.hooks:
+            try:
+                hook(event)
+            except Exception:
+                _LOGGER.exception(f"Request hook {hook!r} failed")
+
     def birthday_list(self, month, months=1):
         _LOGGER.info("Getting birthday list")
         request = {
@@ -98,96 +351,247 @@ class API:
             "params": {"lang": "eng", "month": month, "months": months},
         }
 
-        result = self._make_request(request)
-        return result.json()
+        result = self._make_request(request, endpoint="birthday_list", parse_json=True)
+        return result
 
-    def members_moved_in(self, months):
+    def members_moved_in(self, months, unit_number=None):
+        """
+        Args:
+            unit_number: The unit to report on. Defaults to the unit of the api.
+        """
         _LOGGER.info("Getting members moved in")
+        unit_number = unit_number or self.unit_number
         request = {
-            "url": f"https://{LCR_DOMAIN}/api/report/members-moved-in/unit/{self.unit_number}/{months}",
+            "url": f"https://{LCR_DOMAIN}/api/report/members-moved-in/unit/{unit_number}/{months}",
             "params": {"lang": "eng"},
         }
 
-        result = self._make_request(request)
-        return result.json()
+        result = self._make_request(
+            request, endpoint="members_moved_in", parse_json=True
+        )
+        return result
 
-    def members_moved_out(self, months):
+    def members_moved_out(self, months, unit_number=None):
+        """
+        Args:
+            unit_number: The unit to report on. Defaults to the unit of the api.
+        """
         _LOGGER.info("Getting members moved out")
+        unit_number = unit_number or self.unit_number
         request = {
-            "url": f"https://{LCR_DOMAIN}/api/report/members-moved-out/unit/{self.unit_number}/{months}",
+            "url": f"https://{LCR_DOMAIN}/api/report/members-moved-out/unit/{unit_number}/{months}",
             "params": {"lang": "eng"},
         }
 
-        result = self._make_request(request)
-        return result.json()
+        result = self._make_request(
+            request, endpoint="members_moved_out", parse_json=True
+        )
+        return result
 
-    def member_list(self):
-        _LOGGER.info("Getting member list")
-        request = {
+    def _iter_records(self, request, endpoint, key=None) -> Iterator:
+        """Stream a response and yield the elements of its JSON array one at a time.
+
+        Args:
+            key (str): The member of the response object holding the array, if the response is an
+                object rather than an array.
+        """
+        response = self._make_request({**request, "stream": True}, endpoint=endpoint)
+        try:
+            yield from iter_json_array(response.iter_content(CHUNK_SIZE), key)
+        finally:
+            response.close()
+
+    def _member_list_request(self, unit_number=None):
+        return {
             "url": f"https://{LCR_DOMAIN}/api/umlu/report/member-list",
-            "params": {"lang": "eng", "unitNumber": self.unit_number},
+            "params": {"lang": "eng", "unitNumber": unit_number or self.unit_number},
         }
 
-        result = self._make_request(request)
-        return result.json()
+    def member_list(self, records: bool = False, unit_number=None):
+        """
+        Args:
+            records (bool): Return `lcr.records.Member` records instead of dicts. They take less
+                memory; `Member.to_dict` gives back the dict.
+            unit_number: The unit to get it for. Defaults to the unit of the api.
+        """
+        _LOGGER.info("Getting member list")
+        request = self._member_list_request(unit_number)
 
-    def individual_photo(self, member_id):
+        result = self._make_request(request, endpoint="member_list", parse_json=True)
+        if records:
+            return to_records(Member, result)
+        return result
+
+    def iter_member_list(self, records: bool = False, unit_number=None) -> Iterator:
         """
-        member_id is not the same as Mrn
+        Like `member_list`, but yields one member at a time while the response is downloading.
         """
-        _LOGGER.info("Getting photo for {}".format(member_id))
+        _LOGGER.info("Streaming member list")
+        members = self._iter_records(
+            self._member_list_request(unit_number), "member_list"
+        )
+        if records:
+            return iter_records(Member, members)
+        return members
+
+    def _photo_url(self, member_id):
         request = {
             "url": "https://{}/individual-photo/{}".format(LCR_DOMAIN, member_id),
             "params": {"lang": "eng", "status": "APPROVED"},
         }
 
-        result = self._make_request(request)
-        scdn_url = result.json()["tokenUrl"]
-        return self._make_request({"url": scdn_url}).content
+        result = self._make_request(
+            request, endpoint="individual_photo", parse_json=True
+        )
+        return result.get("tokenUrl")
+
+    def individual_photo(self, member_id):
+        """
+        member_id is not the same as Mrn
+        """
+        _LOGGER.info("Getting photo for {}".format(member_id))
+        scdn_url = self._photo_url(member_id)
+        return self._make_request({"url": scdn_url}, endpoint="photo_content").content
+
+    def download_photos(
+        self,
+        member_ids: Iterable,
+        store: PhotoStore,
+        max_workers: int = 8,
+        refresh: bool = False,
+    ) -> Dict[str, Optional[str]]:
+        """
+        Download the photos of many members straight to a `PhotoStore`.
+
+        The token lookup and the photo download of each member run on a pool of `max_workers`
+        threads, and every photo is streamed to disk rather than held in memory.
 
-    def callings(self):
+        Args:
+            member_ids (Iterable): The ids of the members, the `legacyCmisId` of `member_list`
+                entries. These are not the same as Mrn.
+            store (PhotoStore): Where to save the photos.
+            refresh (bool): Download photos even for members already in `store`.
+
+        Returns:
+            Dict[str, Optional[str]]: The photo hash of every member by member id, or `None` for
+                members without an approved photo.
+        """
+        member_ids = [str(member_id) for member_id in member_ids]
+        _LOGGER.info(f"Getting photos for {len(member_ids)} members")
+
+        def download(member_id):
+            if not refresh:
+                photo_hash = store.hash_for(member_id)
+                if photo_hash:
+                    return photo_hash
+            try:
+                scdn_url = self._photo_url(member_id)
+                if not scdn_url:
+                    return None
+                response = self._make_request(
+                    {"url": scdn_url, "stream": True}, endpoint="photo_content"
+                )
+            except requests.HTTPError as e:
+                # No approved photo, or the photo behind the token is gone.
+                if e.response is not None and e.response.status_code == 404:
+                    return None
+                raise
+            with response:
+                return store.write(member_id, response.iter_content(CHUNK_SIZE))
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                hashes = list(executor.map(download, member_ids))
+        finally:
+            store.save()
+        return dict(zip(member_ids, hashes))
+
+    def callings(self, records: bool = False):
+        """
+        Args:
+            records (bool): Return a flat list of `lcr.records.Calling` records, one per calling,
+                instead of the organization tree.
+        """
         _LOGGER.info("Getting callings for all organizations")
         request = {
             "url": "https://{}/services/orgs/sub-orgs-with-callings".format(LCR_DOMAIN),
             "params": {"lang": "eng"},
         }
 
-        result = self._make_request(request)
-        return result.json()
+        result = self._make_request(request, endpoint="callings", parse_json=True)
+        if records:
+            return to_records(Calling, iter_callings(result))
+        return result
 
-    def members_alt(self):
-        _LOGGER.info("Getting member list")
-        request = {
+    def _members_alt_request(self, unit_number=None):
+        return {
             "url": "https://{}/services/umlu/report/member-list".format(LCR_DOMAIN),
-            "params": {"lang": "eng", "unitNumber": self.unit_number},
+            "params": {"lang": "eng", "unitNumber": unit_number or self.unit_number},
         }
 
-        result = self._make_request(request)
-        return result.json()
+    def members_alt(self, unit_number=None):
+        """
+        Args:
+            unit_number: The unit to get it for. Defaults to the unit of the api.
+        """
+        _LOGGER.info("Getting member list")
+        request = self._members_alt_request(unit_number)
+
+        result = self._make_request(request, endpoint="members_alt", parse_json=True)
+        return result
 
-    def ministering(self, organization: str = None):
+    def iter_members_alt(self, unit_number=None) -> Iterator[dict]:
+        """
+        Like `members_alt`, but yields one member at a time while the response is downloading.
+        """
+        _LOGGER.info("Streaming member list")
+        return self._iter_records(self._members_alt_request(unit_number), "members_alt")
+
+    def _ministering_request(self, organization: str = None, unit_number=None):
+        request = {
+            "url": f"https://{LCR_DOMAIN}/api/umlu/v1/ministering/data-full",
+            "params": {"lang": "eng", "unitNumber": unit_number or self.unit_number},
+        }
+        if organization:
+            if not organization in {"EQ", "RS"}:
+                raise ValueError("organization must be one of 'EQ' or 'RS'")
+            request["params"]["type"] = organization
+        return request
+
+    def ministering(self, organization: str = None, unit_number=None):
         """
         API parameters known to be accepted are lang type unitNumber and quarter.
 
         Args:
             organization (str): The organization type to get ministering information for. This must
                 be either `'EQ'` or `'RS'`
+            unit_number: The unit to get it for. Defaults to the unit of the api.
 
         Returns:
             json: the `json` value from the api response.
         """
         _LOGGER.info("Getting ministering data")
-        request = {
-            "url": f"https://{LCR_DOMAIN}/api/umlu/v1/ministering/data-full",
-            "params": {"lang": "eng", "unitNumber": self.unit_number},
-        }
-        if organization:
-            if not organization in {"EQ", "RS"}:
-                raise ValueError("organization must be one of 'EQ' or 'RS'")
-            request["params"]["type"] = organization
+        request = self._ministering_request(organization, unit_number)
 
-        result = self._make_request(request)
-        return result.json()
+        result = self._make_request(request, endpoint="ministering", parse_json=True)
+        return result
+
+    def iter_ministering(self, organization: str, unit_number=None) -> Iterator[dict]:
+        """
+        Like `ministering`, but yields the districts of one organization one at a time while the
+        response is downloading.
+
+        Args:
+            organization (str): Either `'EQ'` for the `elders` districts or `'RS'` for the
+                `reliefSociety` districts.
+        """
+        _LOGGER.info("Streaming ministering data")
+        if organization not in MINISTERING_DISTRICTS:
+            raise ValueError("organization must be one of 'EQ' or 'RS'")
+        request = self._ministering_request(organization, unit_number)
+        return self._iter_records(
+            request, "ministering", key=MINISTERING_DISTRICTS[organization]
+        )
 
     def access_table(self):
         """
@@ -199,20 +603,45 @@ class API:
             "params": {"lang": "eng"},
         }
 
-        result = self._make_request(request)
-        return result.json()
+        result = self._make_request(request, endpoint="access_table", parse_json=True)
+        return result
 
-    def recommend_status(self):
+    def _recommend_status_request(self, unit_number=None):
+        return {
+            "url": f"https://{LCR_DOMAIN}/api/recommend/recommend-status",
+            "params": {"lang": "eng", "unitNumber": unit_number or self.unit_number},
+        }
+
+    def recommend_status(self, records: bool = False, unit_number=None):
         """
         Obtain member information on recommend status
+
+        Args:
+            records (bool): Return `lcr.records.Recommend` records instead of dicts.
+            unit_number: The unit to get it for. Defaults to the unit of the api.
         """
         _LOGGER.info("Getting recommend status")
-        request = {
-            "url": f"https://{LCR_DOMAIN}/api/recommend/recommend-status",
-            "params": {"lang": "eng", "unitNumber": self.unit_number},
-        }
-        result = self._make_request(request)
-        return result.json()
+        request = self._recommend_status_request(unit_number)
+        result = self._make_request(
+            request, endpoint="recommend_status", parse_json=True
+        )
+        if records:
+            return to_records(Recommend, result)
+        return result
+
+    def iter_recommend_status(
+        self, records: bool = False, unit_number=None
+    ) -> Iterator:
+        """
+        Like `recommend_status`, but yields one member at a time while the response is downloading.
+        """
+        _LOGGER.info("Streaming recommend status")
+        members = self._iter_records(
+            self._recommend_status_request(unit_number), "recommend_status"
+        )
+        if records:
+            return iter_records(Recommend, members)
+        return members
 
     def quarterly_report(self, unit_number, quarter, year):
         """
@@ -230,8 +659,13 @@ class API:
                 "year": year,
             },
         }
-        result = self._make_request(request)
-        return result.json()
+        result = self._make_request(
+            request,
+            endpoint="quarterly_report",
+            immutable=quarter_is_closed(year, quarter),
+            parse_json=True,
+        )
+        return result
 
     def available_report_quarters(self, unit: Unit):
         """
@@ -246,8 +680,62 @@ class API:
                 "unitNumber": unit.number,
             },
         }
-        result = self._make_request(request)
+        result = self._make_request(
+            request, endpoint="available_report_quarters", parse_json=True
+        )
         quarters = []
-        for encoded_quarter in result.json():
+        for encoded_quarter in result:
             quarters.append(Quarter(encoded_quarter))
         return quarters
+
+    def for_units(
+        self,
+        units: Iterable,
+        endpoints: Union[Iterable[str], Dict[str, dict]] = ("member_list",),
+        max_workers: int = 8,
+    ) -> Dict[int, Dict[str, object]]:
+        """Fetch unit scoped endpoints for several units at once over this api's session.
+
+        Every (unit, endpoint) request runs concurrently, so a stake is fetched with one login
+        instead of one `API` per unit.
+
+        Args:
+            units (Iterable): `lcr.unit.Unit`s, as returned by `lcr.unit.load_units`, or unit
+                numbers.
+            endpoints: The names of the methods to call, from `UNIT_ENDPOINTS`. To pass arguments
+                to them, give a dict of keyword arguments by name instead, for example
+                `{"member_list": {}, "members_moved_in": {"months": 3}}`.
+            max_workers (int): The number of requests in flight at once. Keep it at most the
+                `pool_size` of the transport.
+
+        Returns:
+            Dict[int, Dict[str, object]]: The result of every endpoint by name, by unit number.
+        """
+        if not isinstance(endpoints, dict):
+            endpoints = {endpoint: {} for endpoint in endpoints}
+        unknown = set(endpoints) - set(UNIT_ENDPOINTS)
+        if unknown:
+            raise ValueError(
+                f"Not unit scoped endpoints: {', '.join(sorted(unknown))}. "
+                f"Use any of {', '.join(UNIT_ENDPOINTS)}"
+            )
+        unit_numbers = [getattr(unit, "number", unit) for unit in units]
+        jobs = [
+            (unit_number, endpoint)
+            for unit_number in unit_numbers
+            for endpoint in endpoints
+        ]
+        _LOGGER.info(f"Getting {len(jobs)} endpoints for {len(unit_numbers)} units")
+
+        def fetch(job):
+            unit_number, endpoint = job
+            return getattr(self, endpoint)(
+                unit_number=unit_number, **endpoints[endpoint]
+            )
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(fetch, jobs))
+        by_unit = {unit_number: {} for unit_number in unit_numbers}
+        for (unit_number, endpoint), result in zip(jobs, results):
+            by_unit[unit_number][endpoint] = result
+        return by_unit
@@ -0,0 +1,247 @@
+"""An asyncio version of `lcr.api.API`.
+
+`AsyncAPI` has the JSON calls of `API`, with the same arguments, as coroutines. Unit scoped calls
+take the same optional `unit_number`. It does not log in on its own; it reuses the cookies that
+`API._login` captured, so build it with `AsyncAPI.from_api(api)` or pass the cookies directly.
+
+It is a subset of `API`: requests are only limited by `max_concurrency`. There are no retries,
+rate limiting, response cache, request hooks or coalescing of identical requests, and no
+`records`, streaming `iter_*`, `download_photos` or `for_units` calls. A failed request raises
+`aiohttp.ClientResponseError`.
+
+Requires `aiohttp`.
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Tuple
+
+import aiohttp
+
+from lcr.api import API, LCR_DOMAIN, BETA_HOST, HOST
+from lcr.quarter import Quarter
+from lcr.unit import Unit
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 20
+
+
+def _encode_params(params):
+    """aiohttp only accepts str, int and float query values. Booleans are encoded the same way
+    `requests` encodes them."""
+    return {
+        key: str(value) if isinstance(value, bool) else value
+        for key, value in params.items()
+    }
+
+
+class AsyncAPI:
+    def __init__(
+        self,
+        cookies: Dict[str, str],
+        unit_number,
+        beta=False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        root_url: str = f"https://{LCR_DOMAIN}",
+    ):
+        """
+        Args:
+            cookies (Dict[str, str]): The authenticated `appSession` cookies.
+            unit_number: The default unit for unit scoped endpoints.
+            beta (bool): Use the beta version of LCR.
+            max_concurrency (int): The most requests allowed in flight at once. This is also the
+                size of the connection pool.
+            root_url (str): Where LCR is served, for example a test server.
+        """
+        self.unit_number = unit_number
+        self.root_url = root_url.rstrip("/")
+        self.beta = beta
+        self.host = BETA_HOST if beta else HOST
+        self._cookies = dict(cookies)
+        self._max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session = None
+
+    @classmethod
+    def from_api(cls, api: API, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        """Create an `AsyncAPI` that shares the login of an already authenticated `API`."""
+        return cls(
+            api.session.cookies.get_dict(),
+            api.unit_number,
+            beta=api.beta,
+            max_concurrency=max_concurrency,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        if self._session is None:
+            cookies = dict(self._cookies)
+            if self.beta:
+                cookies["clerk-resources-beta-terms"] = "4.1"
+                cookies["clerk-resources-beta-eula"] = "4.2"
+            self._session = aiohttp.ClientSession(
+                cookies=cookies,
+                connector=aiohttp.TCPConnector(limit=self._max_concurrency),
+                raise_for_status=True,  # break on any non 200 status
+            )
+        return self._session
+
+    async def _make_request(self, request, json=True):
+        session = self._get_session()
+        params = _encode_params(request.get("params", {}))
+        async with self._semaphore:
+            async with session.get(request["url"], params=params) as response:
+                if json:
+                    return await response.json(content_type=None)
+                return await response.read()
+
+    async def birthday_list(self, month, months=1):
+        _LOGGER.info("Getting birthday list")
+        request = {
+            "url": f"{self.root_url}/api/report/birthday-list",
+            "params": {"lang": "eng", "month": month, "months": months},
+        }
+        return await self._make_request(request)
+
+    async def members_moved_in(self, months, unit_number=None):
+        _LOGGER.info("Getting members moved in")
+        unit_number = unit_number or self.unit_number
+        request = {
+            "url": f"{self.root_url}/api/report/members-moved-in/unit/{unit_number}/{months}",
+            "params": {"lang": "eng"},
+        }
+        return await self._make_request(request)
+
+    async def members_moved_out(self, months, unit_number=None):
+        _LOGGER.info("Getting members moved out")
+        unit_number = unit_number or self.unit_number
+        request = {
+            "url": f"{self.root_url}/api/report/members-moved-out/unit/{unit_number}/{months}",
+            "params": {"lang": "eng"},
+        }
+        return await self._make_request(request)
+
+    async def member_list(self, unit_number=None):
+        _LOGGER.info("Getting member list")
+        request = {
+            "url": f"{self.root_url}/api/umlu/report/member-list",
+            "params": {"lang": "eng", "unitNumber": unit_number or self.unit_number},
+        }
+        return await self._make_request(request)
+
+    async def individual_photo(self, member_id):
+        """
+        member_id is not the same as Mrn
+        """
+        _LOGGER.info("Getting photo for {}".format(member_id))
+        request = {
+            "url": f"{self.root_url}/individual-photo/{member_id}",
+            "params": {"lang": "eng", "status": "APPROVED"},
+        }
+        result = await self._make_request(request)
+        return await self._make_request({"url": result["tokenUrl"]}, json=False)
+
+    async def callings(self):
+        _LOGGER.info("Getting callings for all organizations")
+        request = {
+            "url": f"{self.root_url}/services/orgs/sub-orgs-with-callings",
+            "params": {"lang": "eng"},
+        }
+        return await self._make_request(request)
+
+    async def members_alt(self, unit_number=None):
+        _LOGGER.info("Getting member list")
+        request = {
+            "url": f"{self.root_url}/services/umlu/report/member-list",
+            "params": {"lang": "eng", "unitNumber": unit_number or self.unit_number},
+        }
+        return await self._make_request(request)
+
+    async def ministering(self, organization: str = None, unit_number=None):
+        """
+        See `API.ministering`.
+        """
+        _LOGGER.info("Getting ministering data")
+        request = {
+            "url": f"{self.root_url}/api/umlu/v1/ministering/data-full",
+            "params": {"lang": "eng", "unitNumber": unit_number or self.unit_number},
+        }
+        if organization:
+            if not organization in {"EQ", "RS"}:
+                raise ValueError("organization must be one of 'EQ' or 'RS'")
+            request["params"]["type"] = organization
+        return await self._make_request(request)
+
+    async def access_table(self):
+        _LOGGER.info("Getting info for data access")
+        request = {
+            "url": f"{self.root_url}/services/access-table",
+            "params": {"lang": "eng"},
+        }
+        return await self._make_request(request)
+
+    async def recommend_status(self, unit_number=None):
+        """
+        Obtain member information on recommend status
+        """
+        _LOGGER.info("Getting recommend status")
+        request = {
+            "url": f"{self.root_url}/api/recommend/recommend-status",
+            "params": {"lang": "eng", "unitNumber": unit_number or self.unit_number},
+        }
+        return await self._make_request(request)
+
+    async def quarterly_report(self, unit_number, quarter, year):
+        """
+        Get the quarterly report for the given unit and quarter.
+        """
+        _LOGGER.info(f"Getting quarterly report for {unit_number} and {quarter}")
+        request = {
+            "url": f"{self.root_url}/api/report/quarterly-report",
+            "params": {
+                "lang": "eng",
+                "unitNumber": unit_number,
+                "populateLabels": True,
+                "quarter": quarter,
+                "year": year,
+            },
+        }
+        return await self._make_request(request)
+
+    async def available_report_quarters(self, unit: Unit):
+        """
+        Get the quarters for which the quarterly report is available.
+        """
+        _LOGGER.info(f"Getting available quarters for {unit}")
+        request = {
+            "url": f"{self.root_url}/api/report/quarterly-report/quarters",
+            "params": {
+                "lang": "eng",
+                "unitNumber": unit.number,
+            },
+        }
+        result = await self._make_request(request)
+        return [Quarter(encoded_quarter) for encoded_quarter in result]
+
+    async def unit_quarterly_reports(self, unit: Unit) -> List[Tuple[Quarter, dict]]:
+        """Get every available quarterly report for a unit in one await.
+
+        The reports are requested concurrently, limited by `max_concurrency`, and returned in the
+        order LCR lists the quarters.
+        """
+        quarters = await self.available_report_quarters(unit)
+        reports = await asyncio.gather(
+            *(self.quarterly_report(unit.number, q.quarter, q.year) for q in quarters)
+        )
+        return list(zip(quarters, reports))
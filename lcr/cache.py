@@ -0,0 +1,233 @@
+"""A persistent, size bounded cache for LCR responses.
+
+Responses are stored in a sqlite database keyed by the host serving them, the request url and its
+normalized parameters.
+Each API endpoint has its own time to live. Entries stored without a time to live (for example
+the quarterly report of a closed quarter) never expire, but like every other entry they are still
+evicted, least recently used first, once the cache grows past `max_bytes`.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlencode
+
+_LOGGER = logging.getLogger(__name__)
+
+USE = "use"
+"""Read from and write to the cache."""
+REFRESH = "refresh"
+"""Always go to the network, then overwrite the cached entry."""
+BYPASS = "bypass"
+"""Neither read from nor write to the cache."""
+
+IMMUTABLE = None
+"""A time to live for entries that never expire."""
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+DEFAULT_TTLS = {
+    "access_table": 24 * 60 * 60,
+    # A new quarter becomes available at the start of every quarter, so an incremental refresh
+    # must not see a list from the day before.
+    "available_report_quarters": 60 * 60,
+    "quarterly_report": 60 * 60,
+}
+"""Time to live in seconds for each `API` method name. Endpoints not listed are not cached."""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    expires REAL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+def make_key(url: str, params=None, host: str = None) -> str:
+    """Build a cache key from a url and its query parameters.
+
+    Parameters are sorted and encoded the same way `requests` encodes them, so equal requests
+    produce equal keys regardless of the order the parameters were given in.
+
+    Args:
+        host (str): The host the response comes from, when it is not the host of `url`. The beta
+            and production versions of LCR answer the same urls, told apart only by cookies.
+    """
+    key = url
+    if params:
+        key = f"{url}?{urlencode(sorted((str(k), str(v)) for k, v in params.items()))}"
+    if host:
+        key = f"{host} {key}"
+    return key
+
+
+class CachedResponse:
+    """The part of `requests.Response` that the API methods use, backed by a cached body."""
+
+    def __init__(self, url: str, status_code: int, content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.from_cache = True
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start : start + chunk_size]
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls=None,
+        mode: str = USE,
+    ):
+        """
+        Args:
+            path: The sqlite file to store responses in. It is created if it does not exist.
+            max_bytes (int): The most response bytes to keep before evicting entries.
+            ttls (Dict[str, float]): Time to live in seconds for each `API` method name. Defaults
+                to `DEFAULT_TTLS`. Endpoints missing from this mapping are not cached.
+            mode (str): One of `USE`, `REFRESH` or `BYPASS`.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    @property
+    def mode(self):
+        return self._mode
+
+    @mode.setter
+    def mode(self, value):
+        if value not in {USE, REFRESH, BYPASS}:
+            raise ValueError(f"mode must be one of '{USE}', '{REFRESH}' or '{BYPASS}'")
+        self._mode = value
+
+    def caches(self, endpoint: str) -> bool:
+        """Whether responses for `endpoint` are cached at all."""
+        return self._mode != BYPASS and endpoint in self.ttls
+
+    def get(self, key: str):
+        """Get a cached response, or `None` if it is missing, expired or the mode skips reads."""
+        if self._mode != USE:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._db.execute(
+                "SELECT status, body, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if entry is None:
+                return None
+            status, body, expires = entry
+            if expires is not None and expires <= now:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self._db.commit()
+        _LOGGER.debug(f"Cache hit for {key}")
+        return CachedResponse(key, status, body)
+
+    def set(self, key: str, endpoint: str, response, immutable: bool = False):
+        """Store a response for `endpoint`.
+
+        Args:
+            immutable (bool): Store the response without an expiry, ignoring the endpoint's ttl.
+        """
+        if not self.caches(endpoint):
+            return
+        now = time.time()
+        ttl = IMMUTABLE if immutable else self.ttls[endpoint]
+        expires = None if ttl is IMMUTABLE else now + ttl
+        body = response.content
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    endpoint,
+                    response.status_code,
+                    body,
+                    len(body),
+                    now,
+                    now,
+                    expires,
+                ),
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        """Remove expired entries, then the least recently used ones until under `max_bytes`."""
+        self._db.execute(
+            "DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?",
+            (time.time(),),
+        )
+        (total,) = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in self._db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        _LOGGER.debug(f"Evicted {len(evicted)} cached responses")
+
+    def invalidate(self, endpoint: str = None):
+        """Remove every cached response, or only those of one endpoint."""
+        with self._lock:
+            if endpoint is None:
+                self._db.execute("DELETE FROM responses")
+            else:
+                self._db.execute(
+                    "DELETE FROM responses WHERE endpoint = ?", (endpoint,)
+                )
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
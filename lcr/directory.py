@@ -0,0 +1,202 @@
+"""An indexed, in memory directory of members joined across API endpoints.
+
+`MemberDirectory` hashes the results of `member_list` by member id, mrn, unit and normalized name,
+and joins the results of `callings`, `ministering`, `recommend_status` and `birthday_list` to
+members once when it is built. Every lookup afterwards is a dict access instead of a scan over a
+list.
+
+Members are identified by their `legacyCmisId` from `member_list`, which is the `id` of
+`recommend_status` and `birthday_list` entries and the `memberId` of callings.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from lcr.api import API, MINISTERING_DISTRICTS
+from lcr.records import iter_callings
+
+_NON_WORD = re.compile(r"[^\w\s]")
+
+_ID_KEYS = ("legacyCmisId", "memberId", "id")
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a name so different spellings of it compare equal.
+
+    Accents, punctuation, case and word order are ignored, so `"Doe, Jane"` and `"jane doe"` give
+    the same result.
+    """
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    words = _NON_WORD.sub(" ", name).casefold().split()
+    return " ".join(sorted(words))
+
+
+def normalize_mrn(mrn) -> str:
+    """Normalize a membership record number, which is sometimes formatted with dashes."""
+    return str(mrn).replace("-", "").strip()
+
+
+def person_id(entry: Dict):
+    """The member id of an entry of any endpoint, or `None` if it has none."""
+    for key in _ID_KEYS:
+        value = entry.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+class MemberDirectory:
+    def __init__(
+        self,
+        members: Iterable[Dict],
+        callings: Iterable[Dict] = None,
+        ministering: Dict = None,
+        recommends: Iterable[Dict] = None,
+        birthdays: Iterable[Dict] = None,
+    ):
+        """
+        Args:
+            members (Iterable[Dict]): The result of `API.member_list`.
+            callings (Iterable[Dict]): The result of `API.callings`.
+            ministering (Dict): The result of `API.ministering`.
+            recommends (Iterable[Dict]): The result of `API.recommend_status`.
+            birthdays (Iterable[Dict]): The result of `API.birthday_list`.
+        """
+        self._members = {}
+        self._by_mrn = {}
+        self._by_unit = defaultdict(list)
+        self._by_name = defaultdict(list)
+        for member in members:
+            self._add_member(member)
+
+        self._callings = defaultdict(list)
+        for calling in iter_callings(callings or ()):
+            member_id = self._resolve(calling)
+            if member_id is not None:
+                self._callings[member_id].append(calling)
+
+        self._assignments = defaultdict(list)
+        self._ministers = defaultdict(list)
+        if ministering:
+            self._join_ministering(ministering)
+
+        self._recommends = {}
+        for recommend in recommends or ():
+            member_id = self._resolve(recommend)
+            if member_id is not None:
+                self._recommends[member_id] = recommend
+
+        self._birthdays = {}
+        for month in birthdays or ():
+            for birthday in month.get("birthdays") or ():
+                member_id = self._resolve(birthday)
+                if member_id is not None:
+                    self._birthdays[member_id] = birthday
+
+    @classmethod
+    def from_api(cls, api: API, birthday_month: int = None):
+        """Build a directory of the unit of `api` from all the endpoints it joins.
+
+        Args:
+            birthday_month (int): Also join the birthday list starting at this month, covering a
+                whole year.
+        """
+        birthdays = None
+        if birthday_month is not None:
+            birthdays = api.birthday_list(birthday_month, 12)
+        ministering = {}
+        for organization, districts in MINISTERING_DISTRICTS.items():
+            ministering[districts] = api.ministering(organization).get(districts) or []
+        return cls(
+            api.member_list(),
+            callings=api.callings(),
+            ministering=ministering,
+            recommends=api.recommend_status(),
+            birthdays=birthdays,
+        )
+
+    def _add_member(self, member: Dict):
+        member_id = person_id(member)
+        if member_id is None:
+            return
+        self._members[member_id] = member
+        if member.get("mrn"):
+            self._by_mrn[normalize_mrn(member["mrn"])] = member_id
+        self._by_unit[member.get("unitNumber")].append(member_id)
+        for name in _names_of(member):
+            ids = self._by_name[normalize_name(name)]
+            if member_id not in ids:
+                ids.append(member_id)
+
+    def _resolve(self, entry: Dict):
+        """The member id of an entry from another endpoint, matched by id and then by mrn."""
+        member_id = person_id(entry)
+        if member_id in self._members:
+            return member_id
+        if entry.get("mrn"):
+            return self._by_mrn.get(normalize_mrn(entry["mrn"]), member_id)
+        return member_id
+
+    def _join_ministering(self, ministering: Dict):
+        for organization in MINISTERING_DISTRICTS.values():
+            for district in ministering.get(organization) or ():
+                for companionship in district.get("companionships") or ():
+                    ministers = companionship.get("ministers") or []
+                    assignments = companionship.get("assignments") or []
+                    for minister in ministers:
+                        self._assignments[person_id(minister)].extend(assignments)
+                    for assignment in assignments:
+                        self._ministers[person_id(assignment)].extend(ministers)
+
+    def __len__(self):
+        return len(self._members)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self._members.values())
+
+    def __contains__(self, member_id):
+        return member_id in self._members
+
+    def get(self, member_id) -> Optional[Dict]:
+        return self._members.get(member_id)
+
+    def by_mrn(self, mrn) -> Optional[Dict]:
+        return self._members.get(self._by_mrn.get(normalize_mrn(mrn)))
+
+    def in_unit(self, unit_number) -> List[Dict]:
+        return [self._members[i] for i in self._by_unit.get(unit_number, ())]
+
+    def find(self, name: str) -> List[Dict]:
+        """The members with a name equal to `name` once both are normalized."""
+        ids = self._by_name.get(normalize_name(name), ())
+        return [self._members[i] for i in ids]
+
+    def callings_of(self, member_id) -> List[Dict]:
+        return list(self._callings.get(member_id, ()))
+
+    def assignments_of(self, member_id) -> List[Dict]:
+        """The people `member_id` is assigned to minister to."""
+        return list(self._assignments.get(member_id, ()))
+
+    def ministers_of(self, member_id) -> List[Dict]:
+        """The ministers assigned to `member_id`."""
+        return list(self._ministers.get(member_id, ()))
+
+    def recommend_of(self, member_id) -> Optional[Dict]:
+        return self._recommends.get(member_id)
+
+    def birthday_of(self, member_id) -> Optional[Dict]:
+        return self._birthdays.get(member_id)
+
+
+def _names_of(member: Dict) -> List[str]:
+    names = [member.get("nameListPreferredLocal")]
+    given = member.get("nameGivenPreferredLocal")
+    family = member.get("nameFamilyPreferredLocal")
+    if given and family:
+        names.append(f"{given} {family}")
+    names.append(member.get("name"))
+    return [name for name in names if name]
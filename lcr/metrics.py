@@ -0,0 +1,242 @@
+"""Per request metrics for `lcr.api.API`.
+
+An `API` calls its hooks with a `RequestEvent` after every request, whether it was answered by the
+network or the response cache. `RequestMetrics` is a hook that aggregates those events per endpoint
+into counts, bytes, retries, cache hits and a latency histogram:
+
+    metrics = RequestMetrics()
+    api = API(username, password, unit_number, hooks=[metrics])
+    ...
+    print(metrics.summary_table())
+    metrics.save("metrics.json")
+"""
+
+import bisect
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+"""The upper bounds in seconds of the latency histogram buckets. Slower requests fall in a last,
+unbounded bucket."""
+
+HIT = "hit"
+MISS = "miss"
+
+
+class RequestEvent:
+    __slots__ = (
+        "endpoint",
+        "url",
+        "status",
+        "latency",
+        "bytes",
+        "retries",
+        "cache",
+        "error",
+    )
+
+    def __init__(
+        self,
+        endpoint: str,
+        url: str,
+        status: Optional[int],
+        latency: float,
+        bytes: Optional[int] = None,
+        retries: int = 0,
+        cache: Optional[str] = None,
+        error: Optional[str] = None,
+    ):
+        """
+        Args:
+            endpoint (str): The name of the API method that made the request.
+            status (int): The response status, or `None` if no response was received.
+            latency (float): Seconds until the response was received. For streamed responses this
+                excludes reading the body.
+            bytes (int): The size of the response body, or `None` if it is not known yet because
+                the response is streamed without a `Content-Length`.
+            retries (int): How many times the transport retried the request.
+            cache (str): `HIT` or `MISS` for endpoints the cache stores, otherwise `None`.
+            error (str): The name of the exception the request failed with, if any.
+        """
+        self.endpoint = endpoint
+        self.url = url
+        self.status = status
+        self.latency = latency
+        self.bytes = bytes
+        self.retries = retries
+        self.cache = cache
+        self.error = error
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return (
+            f"RequestEvent({self.endpoint!r}, status={self.status}, "
+            f"latency={self.latency:.3f}, cache={self.cache})"
+        )
+
+
+class EndpointMetrics:
+    """The aggregated events of one endpoint."""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, event: RequestEvent):
+        self.requests += 1
+        if event.error is not None or event.status is None or event.status >= 400:
+            self.errors += 1
+        self.retries += event.retries
+        self.bytes += event.bytes or 0
+        if event.cache == HIT:
+            self.cache_hits += 1
+        elif event.cache == MISS:
+            self.cache_misses += 1
+        self.total_latency += event.latency
+        self.max_latency = max(self.max_latency, event.latency)
+        self.histogram[bisect.bisect_left(LATENCY_BUCKETS, event.latency)] += 1
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.requests if self.requests else 0.0
+
+    def latency_quantile(self, q: float) -> float:
+        """Estimate a latency quantile as the upper bound of the bucket it falls in.
+
+        Quantiles in the last, unbounded bucket are estimated as the slowest latency seen.
+        """
+        if not self.requests:
+            return 0.0
+        rank = q * self.requests
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.histogram):
+            seen += count
+            if seen >= rank and count:
+                return min(bound, self.max_latency)
+        return self.max_latency
+
+    def to_dict(self) -> Dict:
+        return {
+            "endpoint": self.endpoint,
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "total_latency": self.total_latency,
+            "mean_latency": self.mean_latency,
+            "p50_latency": self.latency_quantile(0.5),
+            "p95_latency": self.latency_quantile(0.95),
+            "max_latency": self.max_latency,
+            "histogram": {
+                **{
+                    f"le_{bound}": count
+                    for bound, count in zip(LATENCY_BUCKETS, self.histogram)
+                },
+                "inf": self.histogram[-1],
+            },
+        }
+
+
+class RequestMetrics:
+    """A thread safe hook aggregating request events per endpoint."""
+
+    def __init__(self, keep_events: bool = False):
+        """
+        Args:
+            keep_events (bool): Also keep every event, to trace the requests one by one.
+        """
+        self._endpoints = {}
+        self.events = [] if keep_events else None
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent):
+        with self._lock:
+            metrics = self._endpoints.get(event.endpoint)
+            if metrics is None:
+                metrics = self._endpoints[event.endpoint] = EndpointMetrics(
+                    event.endpoint
+                )
+            metrics.add(event)
+            if self.events is not None:
+                self.events.append(event)
+
+    def endpoint(self, endpoint: str) -> Optional[EndpointMetrics]:
+        return self._endpoints.get(endpoint)
+
+    def summary(self) -> List[Dict]:
+        """The metrics of every endpoint, the one with the most total latency first."""
+        with self._lock:
+            endpoints = sorted(
+                self._endpoints.values(), key=lambda m: m.total_latency, reverse=True
+            )
+            return [metrics.to_dict() for metrics in endpoints]
+
+    def summary_table(self) -> str:
+        """The summary as a plain text table."""
+        header = (
+            "endpoint",
+            "requests",
+            "errors",
+            "retries",
+            "hits",
+            "misses",
+            "MB",
+            "total s",
+            "mean s",
+            "p50 s",
+            "p95 s",
+            "max s",
+        )
+        rows = [
+            (
+                str(m["endpoint"]),
+                str(m["requests"]),
+                str(m["errors"]),
+                str(m["retries"]),
+                str(m["cache_hits"]),
+                str(m["cache_misses"]),
+                f"{m['bytes'] / 1e6:.2f}",
+                f"{m['total_latency']:.2f}",
+                f"{m['mean_latency']:.3f}",
+                f"{m['p50_latency']:.3f}",
+                f"{m['p95_latency']:.3f}",
+                f"{m['max_latency']:.3f}",
+            )
+            for m in self.summary()
+        ]
+        widths = [
+            max(len(row[i]) for row in [header, *rows]) for i in range(len(header))
+        ]
+        lines = [
+            "  ".join(
+                value.ljust(width) if i == 0 else value.rjust(width)
+                for i, (value, width) in enumerate(zip(row, widths))
+            )
+            for row in [header, *rows]
+        ]
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        data = {"endpoints": self.summary()}
+        if self.events is not None:
+            with self._lock:
+                data["events"] = [event.to_dict() for event in self.events]
+        return json.dumps(data, indent=2)
+
+    def save(self, path):
+        """Export the summary, and the events if they are kept, as JSON."""
+        Path(path).write_text(self.to_json())
@@ -0,0 +1,99 @@
+"""A content addressed, on disk store for member photos.
+
+Each photo is saved once under the sha256 hash of its bytes, so identical photos share one file.
+An index maps member ids to the hash of their photo, which lets a bulk download skip members whose
+photo is already stored.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PhotoStore:
+    def __init__(self, root):
+        """
+        Args:
+            root: The directory to store photos in. It is created if it does not exist.
+        """
+        self.root = Path(root)
+        self._objects = self.root / "objects"
+        self._objects.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.root / "index.json"
+        self._lock = threading.Lock()
+        self._index = {}
+        if self._index_path.exists():
+            with open(self._index_path) as f:
+                self._index = json.load(f)
+
+    def path_for(self, photo_hash: str) -> Path:
+        return self._objects / photo_hash[:2] / photo_hash[2:]
+
+    def hash_for(self, member_id) -> Optional[str]:
+        """The hash of a member's stored photo, or `None` if it is not stored."""
+        with self._lock:
+            photo_hash = self._index.get(str(member_id))
+        if photo_hash and self.path_for(photo_hash).exists():
+            return photo_hash
+        return None
+
+    def has(self, member_id) -> bool:
+        return self.hash_for(member_id) is not None
+
+    def read(self, member_id) -> Optional[bytes]:
+        photo_hash = self.hash_for(member_id)
+        if photo_hash is None:
+            return None
+        return self.path_for(photo_hash).read_bytes()
+
+    def write(self, member_id, chunks) -> str:
+        """Stream a photo to the store.
+
+        The chunks are hashed while they are written to a temporary file, so the photo is never
+        held in memory as a whole.
+
+        Returns:
+            str: The sha256 hash the photo is stored under.
+        """
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self._objects, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    f.write(chunk)
+            photo_hash = digest.hexdigest()
+            path = self.path_for(photo_hash)
+            path.parent.mkdir(exist_ok=True)
+            if path.exists():
+                os.remove(temp_path)
+            else:
+                os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        with self._lock:
+            self._index[str(member_id)] = photo_hash
+        return photo_hash
+
+    def index(self) -> Dict[str, str]:
+        """The photo hash of every stored member, by member id."""
+        with self._lock:
+            return dict(self._index)
+
+    def save(self):
+        """Write the member index to disk."""
+        with self._lock:
+            index = dict(self._index)
+        temp_path = self._index_path.with_suffix(".json.part")
+        with open(temp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(temp_path, self._index_path)
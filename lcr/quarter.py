@@ -1,32 +1,147 @@
+"""Calendar quarters.
+
+`Quarter` is an immutable value: quarters can be compared, sorted and used as dict keys or set
+members. They parse and format both the `2023-1` form LCR uses and the `2023-Q1` form of the report
+tables, and support arithmetic in whole quarters:
+
+    Quarter("2023-Q4") + 1 == Quarter(2024, 1)
+    list(Quarter.range(Quarter(2023, 3), Quarter(2024, 1)))  # 2023-Q3, 2023-Q4, 2024-Q1
+"""
+
+import re
+from datetime import date
+from functools import total_ordering
+from typing import Iterator
+
+_QUARTER_PATTERN = re.compile(r"^\s*(\d{4})\s*-?\s*[Qq]?([1-4])\s*$")
+
+
+@total_ordering
 class Quarter:
-    def __init__(self, year, quarter):
-        self._year = year
-        self._quarter = quarter
+    __slots__ = ("_year", "_quarter")
+
+    def __init__(self, year, quarter: int = None):
+        """
+        Args:
+            year: The year, or a quarter to parse like `"2023-1"` or `"2023-Q1"` when `quarter` is
+                not given.
+            quarter (int): The quarter of the year, 1 through 4.
+        """
+        if quarter is None:
+            if isinstance(year, Quarter):
+                year, quarter = year.year, year.quarter
+            else:
+                year, quarter = _parse(year)
+        if isinstance(year, bool) or not isinstance(year, int):
+            raise ValueError("Year must be an integer.")
+        if isinstance(quarter, bool) or not isinstance(quarter, int):
+            raise ValueError("Quarter must be an integer")
+        if not 1 <= quarter <= 4:
+            raise ValueError(f"Quarter must be between 1 and 4, not {quarter}")
+        object.__setattr__(self, "_year", year)
+        object.__setattr__(self, "_quarter", quarter)
 
-    def __init__(self, encoded_quarter: str):
-        y, q = encoded_quarter.split("-")
-        self._year = int(y)
-        self._quarter = int(q)
+    @classmethod
+    def parse(cls, text: str) -> "Quarter":
+        """Parse `"2023-1"`, `"2023-Q1"` or `"2023Q1"`."""
+        return cls(*_parse(text))
+
+    @classmethod
+    def from_index(cls, index: int) -> "Quarter":
+        """The quarter with the given `index`."""
+        year, offset = divmod(index, 4)
+        return cls(year, offset + 1)
+
+    @classmethod
+    def from_date(cls, day: date) -> "Quarter":
+        """The quarter `day` falls in."""
+        return cls(day.year, (day.month - 1) // 3 + 1)
+
+    @classmethod
+    def current(cls, today: date = None) -> "Quarter":
+        return cls.from_date(today or date.today())
+
+    @classmethod
+    def range(cls, start: "Quarter", end: "Quarter") -> Iterator["Quarter"]:
+        """Every quarter from `start` through `end`, both included."""
+        for index in range(Quarter(start).index, Quarter(end).index + 1):
+            yield cls.from_index(index)
 
     @property
-    def year(self):
+    def year(self) -> int:
         return self._year
 
-    @year.setter
-    def name(self, value):
-        if not isinstance(value, int):
-            raise ValueError("Year must be an integer.")
-        self._name = value
-
     @property
-    def quarter(self):
+    def quarter(self) -> int:
         return self._quarter
 
-    @quarter.setter
-    def number(self, value):
-        if not isinstance(value, int):
-            raise ValueError("Quarter must be an integer")
-        self._quarter = value
+    @property
+    def index(self) -> int:
+        """The number of quarters since the start of year 0, so consecutive quarters differ by 1."""
+        return self._year * 4 + self._quarter - 1
+
+    @property
+    def encoded(self) -> str:
+        """The quarter the way LCR encodes it, like `2023-1`."""
+        return f"{self._year}-{self._quarter}"
+
+    def is_closed(self, today: date = None) -> bool:
+        """Whether the quarterly report for this quarter can no longer change."""
+        return quarter_is_closed(self._year, self._quarter, today)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Quarter is immutable")
+
+    def __reduce__(self):
+        return type(self), (self._year, self._quarter)
+
+    def __eq__(self, other):
+        if not isinstance(other, Quarter):
+            return NotImplemented
+        return self.index == other.index
+
+    def __lt__(self, other):
+        if not isinstance(other, Quarter):
+            return NotImplemented
+        return self.index < other.index
+
+    def __hash__(self):
+        return hash((self._year, self._quarter))
+
+    def __add__(self, quarters: int) -> "Quarter":
+        if not isinstance(quarters, int):
+            return NotImplemented
+        return Quarter.from_index(self.index + quarters)
+
+    def __sub__(self, other):
+        """`quarter - n` is the quarter `n` before; `quarter - other` the quarters in between."""
+        if isinstance(other, Quarter):
+            return self.index - other.index
+        if isinstance(other, int):
+            return Quarter.from_index(self.index - other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Quarter({self._year}, {self._quarter})"
 
     def __str__(self):
         return f"{self._year}-Q{self._quarter}"
+
+
+def _parse(text: str):
+    match = _QUARTER_PATTERN.match(str(text))
+    if match is None:
+        raise ValueError(f"Invalid quarter '{text}'")
+    return int(match.group(1)), int(match.group(2))
+
+
+def quarter_is_closed(year: int, quarter: int, today: date = None) -> bool:
+    """Whether the quarterly report for a quarter can no longer change.
+
+    Units can still update a quarterly report during the quarter that follows it, so a quarter is
+    treated as closed once that following quarter has ended as well.
+    """
+    if today is None:
+        today = date.today()
+    current = today.year * 4 + (today.month - 1) // 3
+    return current - (year * 4 + quarter - 1) >= 2
@@ -1,50 +1,273 @@
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import pandas as pd
 from lcr.api import API
 from lcr.quarter import Quarter
+from lcr.report_storage import (
+    KEY_COLUMNS,
+    read_quarterly_report,
+    write_quarterly_report,
+)
 from lcr.unit import Unit
 
 
+class QuarterlyReport:
+    """A quarterly report response indexed for lookups.
+
+    The sections and rows of the response are indexed once by `(section id, row id)`, where the ids
+    are their `nameResourceId`s, so looking up a value is a dict access instead of a scan over every
+    section and row.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self, qrp: dict):
+        """
+        Args:
+            qrp (dict): The result of `API.quarterly_report`.
+        """
+        self._values = {}
+        for section in qrp.get("sections") or ():
+            section_id = section.get("nameResourceId")
+            for row in section.get("rows") or ():
+                self._values[(section_id, row.get("nameResourceId"))] = (
+                    row.get("actualValue"),
+                    row.get("potentialValue"),
+                )
+
+    @classmethod
+    def of(cls, qrp) -> "QuarterlyReport":
+        """`qrp` parsed, unless it already is a `QuarterlyReport`."""
+        return qrp if isinstance(qrp, cls) else cls(qrp)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, field: Tuple[str, str]):
+        return field in self._values
+
+    def get(self, section_id: str, row_id: str) -> Optional[Tuple]:
+        """The `(actual, potential)` values of a row, or `None` if the report has no such row."""
+        return self._values.get((section_id, row_id))
+
+    def actual(self, section_id: str, row_id: str):
+        """The actual value of a row. Raises `KeyError` if the report has no such row."""
+        return self._values[(section_id, row_id)][0]
+
+    def potential(self, section_id: str, row_id: str):
+        """The potential value of a row. Raises `KeyError` if the report has no such row."""
+        return self._values[(section_id, row_id)][1]
+
+    def values(self, fields: Iterable[Tuple[str, str]]) -> Dict[str, object]:
+        """The actual values of several rows at once.
+
+        Args:
+            fields (Iterable[Tuple[str, str]]): `(section id, row id)` pairs.
+
+        Returns:
+            Dict[str, object]: The actual value by row id. Rows missing from the report are `None`.
+        """
+        values = {}
+        for field in fields:
+            value = self._values.get(field)
+            values[field[1]] = None if value is None else value[0]
+        return values
+
+    def fields(self) -> Iterator[Tuple[str, str, object, object]]:
+        """Every `(section id, row id, actual, potential)` of the report, in the order of the
+        response."""
+        for (section_id, row_id), (actual, potential) in self._values.items():
+            yield section_id, row_id, actual, potential
+
+    def rows(self) -> Iterator[Tuple[str, object, object]]:
+        """Every `(row id, actual, potential)` of the report, in the order of the response."""
+        for (_, row_id), (actual, potential) in self._values.items():
+            yield row_id, actual, potential
+
+
+def _is_whole_number(value) -> bool:
+    """Whether `value` fits an `Int64` column without changing its meaning. Booleans and numeric
+    strings do not."""
+    if value is None:
+        return True
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return True
+    return isinstance(value, float) and value.is_integer()
+
+
+class QuarterlyReportColumns:
+    """Flattens quarterly reports straight into one array per column.
+
+    Every report becomes one row: the `KEY_COLUMNS` followed by the actual value of every report
+    row under its `nameResourceId` and the potential value under `<nameResourceId>.potential`.
+    Columns are ordered by when they were first seen. A column missing from a report is empty for
+    that row.
+    """
+
+    def __init__(self):
+        self._columns = {column: [] for column in KEY_COLUMNS}
+        self._rows = 0
+
+    def __len__(self):
+        return self._rows
+
+    def _set(self, column: str, value):
+        values = self._columns.get(column)
+        if values is None:
+            values = self._columns[column] = [None] * self._rows
+        if len(values) > self._rows:
+            # The same resource id appeared twice in one report; the last value wins.
+            values[self._rows] = value
+        else:
+            values.append(value)
+
+    def add(self, unit: Unit, quarter: Quarter, qrp):
+        """Add the report `qrp` of `unit` for `quarter` as the next row.
+
+        `qrp` is the result of `API.quarterly_report` or a `QuarterlyReport` of it.
+        """
+        self._set("year", quarter.year)
+        self._set("quarter.num", quarter.quarter)
+        self._set("quarter", str(quarter))
+        self._set("unitId", unit.number)
+        self._set("unitName", unit.name)
+        for row_id, actual, potential in QuarterlyReport.of(qrp).rows():
+            self._set(row_id, actual)
+            self._set(f"{row_id}.potential", potential)
+        self._rows += 1
+        for values in self._columns.values():
+            if len(values) < self._rows:
+                values.append(None)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Build the table. Columns holding only whole numbers get the `Int64` dtype."""
+        data = {}
+        for column, values in self._columns.items():
+            if all(map(_is_whole_number, values)):
+                data[column] = pd.array(values, dtype="Int64")
+            else:
+                data[column] = values
+        return pd.DataFrame(data, columns=list(self._columns))
+
+
 class HistoricalQuarterlyReport:
-    def __init__(self, api: API, units):
+    def __init__(self, api: API, units, max_workers: int = 1):
+        """
+        Args:
+            api (API): An authenticated api used for every request.
+            units (List[Unit]): The units to report on.
+            max_workers (int): The number of requests allowed in flight at once. `1` fetches every
+                quarter serially; anything larger fetches the units and quarters concurrently over
+                the shared session of `api`. Keep it at most the `pool_size` of the api's transport.
+        """
         self._api = api
         self._units = units
+        self._max_workers = max_workers
+
+    def __imap(self, fn, items) -> Iterator:
+        """Apply `fn` to every item, using `max_workers` threads when concurrency is enabled.
+
+        Results are yielded in the order of `items` as soon as each is ready, so they can be
+        consumed while later items are still being fetched.
+        """
+        if self._max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                yield from executor.map(fn, items)
+        else:
+            for item in items:
+                yield fn(item)
+
+    def __map(self, fn, items) -> list:
+        return list(self.__imap(fn, items))
 
-    def __get_report_row(self, lcr: API, unit: Unit, quarter: Quarter):
-        qrp = lcr.quarterly_report(unit.number, quarter.quarter, quarter.year)
-        reduced_row = {
-            "year": quarter.year,
-            "quarter.num": quarter.number,
-            "quarter": str(quarter),
-            "unitId": unit.number,
-            "unitName": unit.name,
-        }
-        for section in qrp["sections"]:
-            for row in section["rows"]:
-                reduced_row[row["nameResourceId"]] = row["actualValue"]
-                reduced_row[f"{row['nameResourceId']}.potential"] = row[
-                    "potentialValue"
-                ]
-        return reduced_row
-
-    def __get_quarterly_report_for_unit(self, unit: Unit, lcr: API):
-        quarters = lcr.available_report_quarters(unit)
-        unit_report = []
-        for q in quarters:
-            row = self.__get_report_row(lcr, unit, q)
-            unit_report.append(row)
-        return unit_report
+    def __get_reports(self, jobs: List[Tuple[Unit, Quarter]], lcr: API) -> pd.DataFrame:
+        """Fetch the report of every (unit, quarter) job and flatten them into one table."""
+        reports = self.__imap(
+            lambda job: lcr.quarterly_report(
+                job[0].number, job[1].quarter, job[1].year
+            ),
+            jobs,
+        )
+        columns = QuarterlyReportColumns()
+        for (unit, quarter), qrp in zip(jobs, reports):
+            columns.add(unit, quarter, qrp)
+        return columns.to_frame()
+
+    def __update_quarterly_report(
+        self, existing: pd.DataFrame, units: List[Unit], lcr: API
+    ) -> pd.DataFrame:
+        """Fetch only the quarters missing from `existing`, plus those that are not closed yet.
+
+        Rows of refetched quarters replace the stored ones. The result is ordered like a full
+        download: by unit, then by the order LCR lists the quarters in.
+        """
+        stored = set(report_row_keys(existing))
+        unit_quarters = self.__map(lcr.available_report_quarters, units)
+        jobs = []
+        order = {}
+        for unit_index, (unit, quarters) in enumerate(zip(units, unit_quarters)):
+            for quarter_index, q in enumerate(quarters):
+                key = (unit.number, q)
+                order[key] = (unit_index, quarter_index)
+                if key not in stored or not q.is_closed():
+                    jobs.append((unit, q))
+        if not jobs:
+            return existing
+
+        updates = self.__get_reports(jobs, lcr)
+        refetched = set(report_row_keys(updates))
+        keep = [key not in refetched for key in report_row_keys(existing)]
+        df = pd.concat([existing[keep], updates], ignore_index=True)
+        # Rows of units or quarters that are no longer available stay at the end.
+        unknown = (len(units), 0)
+        sort_keys = [order.get(key, unknown) for key in report_row_keys(df)]
+        df = df.iloc[sorted(range(len(df)), key=sort_keys.__getitem__)]
+        return df.reset_index(drop=True)
 
     def __get_quarterly_report(self, units: List[Unit], lcr: API) -> pd.DataFrame:
-        report_table = []
-        for unit in units:
-            unit_report = self.__get_quarterly_report_for_unit(unit, lcr)
-            report_table = report_table + unit_report
-        df = pd.DataFrame(report_table)
-        return df
+        """Fetch every available quarter of every unit.
+
+        Quarter discovery runs for all units first, then every (unit, quarter) report is fetched.
+        """
+        unit_quarters = self.__map(lcr.available_report_quarters, units)
+        jobs = [
+            (unit, quarter)
+            for unit, quarters in zip(units, unit_quarters)
+            for quarter in quarters
+        ]
+        return self.__get_reports(jobs, lcr)
 
-    def download_historical_quarters_to_csv(self, stake_units, output_path: str):
-        df = self.__get_quarterly_report(stake_units, self._api)
-        df.to_csv(output_path, index=False)
+    def download_historical_quarters(
+        self, stake_units, output_path: str, incremental: bool = False
+    ):
+        """Download the quarterly reports of `stake_units` and save them.
+
+        The file format is picked from the extension of `output_path`; see `lcr.report_storage`.
+
+        Args:
+            incremental (bool): When `output_path` already exists, keep its closed quarters and only
+                download the quarters that are missing or can still change. A quarterly refresh
+                then costs one request per unit instead of one per unit and quarter of history.
+        """
+        if incremental and Path(output_path).exists():
+            existing = read_quarterly_report(output_path)
+            df = self.__update_quarterly_report(existing, stake_units, self._api)
+        else:
+            df = self.__get_quarterly_report(stake_units, self._api)
+        write_quarterly_report(df, output_path)
         return df
+
+    def download_historical_quarters_to_csv(
+        self, stake_units, output_path: str, incremental: bool = False
+    ):
+        """Download the quarterly reports of `stake_units` and save them as csv."""
+        return self.download_historical_quarters(stake_units, output_path, incremental)
+
+
+def report_row_keys(df: pd.DataFrame):
+    """The (unit number, `Quarter`) pair of every row in a quarterly report table."""
+    return list(zip(df["unitId"], map(Quarter.parse, df["quarter"])))
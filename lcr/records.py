@@ -0,0 +1,257 @@
+"""Compact typed records for API results.
+
+Each record class stores the keys of one API result in `__slots__` instead of a dict, which avoids
+the per-key overhead of a dict for every member in a list. Attributes are the JSON keys in snake
+case, for example `Member.unit_name` for `unitName`. Strings that repeat across many records, such
+as unit names or gender and priesthood codes, are interned so every record shares one copy.
+
+Keys a record class does not know about are kept in `extra`, so `to_dict` returns every key of the
+original result. Known keys missing from the result are left unset: reading their attribute gives
+`None`, but `to_dict` leaves them out, so `Record.from_dict(d).to_dict() == d`.
+"""
+
+import re
+import sys
+from typing import Dict, Iterable, Iterator, List
+
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+
+def snake_case(key: str) -> str:
+    return _CAMEL_BOUNDARY.sub("_", key).lower()
+
+
+class Record:
+    FIELDS = ()
+    """The JSON keys of the result, in the order of `__slots__`."""
+    INTERNED = frozenset()
+    """The JSON keys whose string values are interned."""
+
+    __slots__ = ("extra",)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._FIELD_SET = frozenset(cls.FIELDS)
+        cls._SLOT_SET = frozenset(cls.__slots__)
+
+    @classmethod
+    def from_dict(cls, data: Dict):
+        record = cls.__new__(cls)
+        extra = None
+        for key, value in data.items():
+            if key not in cls._FIELD_SET:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        for key, attribute in zip(cls.FIELDS, cls.__slots__):
+            if key not in data:
+                continue
+            value = data[key]
+            if key in cls.INTERNED and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(record, attribute, value)
+        record.extra = extra
+        return record
+
+    def to_dict(self) -> Dict:
+        """The record as the dict the API returned."""
+        data = {}
+        for key, attribute in zip(self.FIELDS, self.__slots__):
+            try:
+                data[key] = object.__getattribute__(self, attribute)
+            except AttributeError:  # the key was missing from the result
+                pass
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __getattr__(self, name):
+        """Known keys missing from the result read as `None`."""
+        if name in self._SLOT_SET:
+            return None
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        fields = ", ".join(
+            f"{attribute}={getattr(self, attribute)!r}"
+            for attribute in self.__slots__[:3]
+        )
+        return f"{type(self).__name__}({fields}, ...)"
+
+
+def _slots(fields) -> tuple:
+    return tuple(snake_case(key) for key in fields)
+
+
+class Member(Record):
+    """An entry of `API.member_list`."""
+
+    FIELDS = (
+        "legacyCmisId",
+        "uuid",
+        "personUuid",
+        "mrn",
+        "nameListPreferredLocal",
+        "nameGivenPreferredLocal",
+        "nameFamilyPreferredLocal",
+        "nameOrder",
+        "nameFormats",
+        "houseHoldMemberNameForList",
+        "householdNameDirectoryLocal",
+        "householdNameFamilyLocal",
+        "householdUuid",
+        "householdAnchorPersonUuid",
+        "householdRole",
+        "householdMember",
+        "households",
+        "isHead",
+        "isSpouse",
+        "isAdult",
+        "isMember",
+        "member",
+        "isOutOfUnitMember",
+        "outOfUnitMember",
+        "isProspectiveElder",
+        "isSingleAdult",
+        "isYoungSingleAdult",
+        "youthBasedOnAge",
+        "age",
+        "birth",
+        "sex",
+        "convert",
+        "priesthoodOffice",
+        "priesthoodTeacherOrAbove",
+        "positions",
+        "unitName",
+        "unitNumber",
+        "unitOrgsCombined",
+        "membershipUnit",
+        "address",
+        "formattedAddress",
+        "email",
+        "emails",
+        "phoneNumber",
+        "phones",
+        "personStatusFlags",
+        "wamPolicy",
+    )
+    INTERNED = frozenset({"sex", "householdRole", "priesthoodOffice", "unitName"})
+    __slots__ = _slots(FIELDS)
+
+
+class Recommend(Record):
+    """An entry of `API.recommend_status`."""
+
+    FIELDS = (
+        "id",
+        "mrn",
+        "formattedMrn",
+        "name",
+        "spokenName",
+        "nameOrder",
+        "gender",
+        "genderCode",
+        "genderLabelShort",
+        "age",
+        "actualAge",
+        "actualAgeInMonths",
+        "birthDate",
+        "birthDateFormatted",
+        "birthDateSort",
+        "birthDayFormatted",
+        "birthDaySort",
+        "accountable",
+        "notAccountable",
+        "nonMember",
+        "notBaptized",
+        "outOfUnitMember",
+        "unordained",
+        "priesthood",
+        "priesthoodCode",
+        "priesthoodType",
+        "setApart",
+        "sustainedDate",
+        "endowmentDate",
+        "marriageDate",
+        "recommendStatus",
+        "recommendStatusSimple",
+        "recommendEditable",
+        "status",
+        "type",
+        "expirationDate",
+        "unitName",
+        "unitNumber",
+        "email",
+        "phone",
+        "visible",
+    )
+    INTERNED = frozenset(
+        {
+            "gender",
+            "genderCode",
+            "genderLabelShort",
+            "priesthood",
+            "priesthoodCode",
+            "priesthoodType",
+            "recommendStatus",
+            "recommendStatusSimple",
+            "status",
+            "type",
+            "unitName",
+        }
+    )
+    __slots__ = _slots(FIELDS)
+
+
+class Calling(Record):
+    """A calling of `API.callings`, together with the organization it belongs to."""
+
+    FIELDS = (
+        "memberId",
+        "memberName",
+        "position",
+        "positionId",
+        "positionTypeId",
+        "activeDate",
+        "setApart",
+        "organization",
+        "subOrgId",
+        "unitNumber",
+    )
+    INTERNED = frozenset({"position", "organization"})
+    __slots__ = _slots(FIELDS)
+
+
+def to_records(record_class, results: Iterable[Dict]) -> List[Record]:
+    return [record_class.from_dict(result) for result in results]
+
+
+def iter_records(record_class, results: Iterable[Dict]) -> Iterator[Record]:
+    for result in results:
+        yield record_class.from_dict(result)
+
+
+def iter_callings(organizations: Iterable[Dict]) -> Iterator[Dict]:
+    """Flatten the organization tree of `API.callings` into one dict per calling.
+
+    Each calling gets the `organization` name, `subOrgId` and `unitNumber` of the organization it
+    was found in.
+    """
+    stack = list(reversed(list(organizations)))
+    while stack:
+        organization = stack.pop()
+        for calling in organization.get("callings") or ():
+            yield {
+                "organization": organization.get("name"),
+                "subOrgId": organization.get("subOrgId"),
+                "unitNumber": organization.get("unitNumber"),
+                **calling,
+            }
+        stack.extend(reversed(organization.get("children") or ()))
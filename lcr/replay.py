@@ -0,0 +1,176 @@
+"""Record LCR responses and replay them without a network.
+
+`RecordingTransport` saves every request and response an `API` makes to a directory, one folder per
+endpoint method. `ReplayTransport` serves those recordings back, optionally with added latency and
+injected errors. Combined with `API.from_cookies` this runs the whole fetch pipeline with no
+network and no Chrome:
+
+    api = API.from_cookies({}, 12345, transport=ReplayTransport("recordings"))
+
+Both transports keep the retry and rate limiting behaviour of `lcr.transport.Transport`, so that
+can be exercised against replayed failures as well.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+from lcr.cache import make_key
+from lcr.transport import Transport
+
+_LOGGER = logging.getLogger(__name__)
+
+OTHER_ENDPOINT = "other"
+"""The folder for requests made without an endpoint name."""
+
+
+class RecordingMissingError(KeyError):
+    """A replayed request has no recording."""
+
+
+def recording_path(directory, endpoint: str, url: str, params=None) -> Path:
+    key = make_key(url, params)
+    name = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+    return Path(directory) / (endpoint or OTHER_ENDPOINT) / f"{name}.json"
+
+
+def save_recording(
+    directory,
+    endpoint: str,
+    url: str,
+    params,
+    status_code: int,
+    content: bytes,
+    headers=None,
+):
+    """Save one request/response pair.
+
+    Text bodies are stored as is so recordings can be read and edited by hand; anything else is
+    stored base64 encoded.
+    """
+    recording = {
+        "endpoint": endpoint,
+        "url": url,
+        "params": {str(k): str(v) for k, v in (params or {}).items()},
+        "status": status_code,
+        "headers": dict(headers or {}),
+    }
+    try:
+        recording["body"] = content.decode("utf-8")
+    except UnicodeDecodeError:
+        recording["body_base64"] = base64.b64encode(content).decode("ascii")
+    path = recording_path(directory, endpoint, url, params)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(recording, f, indent=2)
+    return path
+
+
+def load_recording(directory, endpoint: str, url: str, params=None) -> dict:
+    path = recording_path(directory, endpoint, url, params)
+    if not path.exists():
+        raise RecordingMissingError(
+            f"No recording of {make_key(url, params)} for {endpoint or OTHER_ENDPOINT}"
+        )
+    with open(path) as f:
+        return json.load(f)
+
+
+def build_response(url: str, status_code: int, content: bytes, headers=None):
+    """Build a `requests.Response` that behaves like one received from the network."""
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response.reason = requests.status_codes._codes.get(status_code, ("",))[0].upper()
+    response.headers.update(headers or {})
+    response._content = content
+    response._content_consumed = True
+    response.encoding = "utf-8"
+    return response
+
+
+class RecordingTransport(Transport):
+    def __init__(self, directory, **kwargs):
+        """
+        Args:
+            directory: Where to save the recordings.
+            kwargs: The arguments of `lcr.transport.Transport`.
+        """
+        super().__init__(**kwargs)
+        self.directory = Path(directory)
+
+    def _send(self, session, request, endpoint=None):
+        response = super()._send(session, request, endpoint)
+        # Reading the content consumes a streamed body, but `iter_content` still serves it
+        # afterwards from the stored content.
+        save_recording(
+            self.directory,
+            endpoint,
+            request["url"],
+            request.get("params"),
+            response.status_code,
+            response.content,
+            {"Content-Type": response.headers.get("Content-Type", "")},
+        )
+        return response
+
+
+class ReplayTransport(Transport):
+    def __init__(
+        self,
+        directory,
+        latency: float = 0,
+        jitter: float = 0,
+        error_rate: float = 0,
+        error_status: int = 503,
+        seed=None,
+        **kwargs,
+    ):
+        """
+        Args:
+            directory: Where the recordings were saved by a `RecordingTransport`.
+            latency (float): Seconds every replayed request takes.
+            jitter (float): Up to this many seconds are randomly added to `latency`.
+            error_rate (float): The fraction of requests answered with `error_status` instead of
+                their recording.
+            error_status (int): The status of injected errors.
+            seed: Seeds the random latency and errors so runs can be repeated.
+            kwargs: The arguments of `lcr.transport.Transport`.
+        """
+        super().__init__(**kwargs)
+        self.directory = Path(directory)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+
+    def mount(self, session):
+        pass
+
+    def _send(self, session, request, endpoint=None):
+        with self._random_lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        url = request["url"]
+        if fail:
+            _LOGGER.debug(f"Injecting status {self.error_status} for {url}")
+            return build_response(url, self.error_status, b"")
+        recording = load_recording(self.directory, endpoint, url, request.get("params"))
+        if "body_base64" in recording:
+            content = base64.b64decode(recording["body_base64"])
+        else:
+            content = recording["body"].encode("utf-8")
+        return build_response(
+            recording["url"], recording["status"], content, recording.get("headers")
+        )
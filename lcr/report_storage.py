@@ -0,0 +1,113 @@
+"""Read and write historical quarterly report tables.
+
+Tables can be stored as csv or, with `pyarrow` installed, in the columnar Parquet and Feather
+formats. The columnar formats keep typed columns: the report values are nullable integers and the
+unit and quarter columns are categorical, so loading them does not re-parse hundreds of columns as
+text. The format is picked from the file extension.
+"""
+
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+
+CSV = "csv"
+PARQUET = "parquet"
+FEATHER = "feather"
+
+FORMATS = {".csv": CSV, ".parquet": PARQUET, ".feather": FEATHER}
+
+KEY_COLUMNS = ["year", "quarter.num", "quarter", "unitId", "unitName"]
+"""Columns identifying a row. They are always loaded, whichever columns are requested."""
+CATEGORICAL_COLUMNS = ["quarter", "unitName"]
+
+
+def storage_format(path) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix not in FORMATS:
+        raise ValueError(
+            f"Unsupported report file type '{suffix}'. Use one of {', '.join(FORMATS)}"
+        )
+    return FORMATS[suffix]
+
+
+def with_report_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Give a quarterly report table its storage dtypes.
+
+    Report values become nullable integers, `quarter` becomes a categorical ordered by time and
+    `unitName` a categorical.
+    """
+    df = df.copy()
+    for column in df.columns:
+        if column in CATEGORICAL_COLUMNS:
+            continue
+        values = df[column]
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(
+            values
+        ):
+            integral = values.dropna()
+            if (integral == integral.round()).all():
+                df[column] = values.astype("Int64")
+    if "quarter" in df.columns:
+        if {"year", "quarter.num"}.issubset(df.columns):
+            quarters = df.sort_values(["year", "quarter.num"])["quarter"]
+        else:
+            quarters = df["quarter"].sort_values()
+        df["quarter"] = pd.Categorical(
+            df["quarter"].astype(str),
+            categories=quarters.astype(str).unique(),
+            ordered=True,
+        )
+    if "unitName" in df.columns:
+        df["unitName"] = df["unitName"].astype(str).astype("category")
+    return df
+
+
+def with_numpy_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Turn nullable integer columns back into the numpy dtypes `pd.read_csv` would produce.
+
+    Columns without missing values become `int64`, the others `float64`.
+    """
+    df = df.copy()
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.Int64Dtype):
+            if df[column].hasnans:
+                df[column] = df[column].astype("float64")
+            else:
+                df[column] = df[column].astype("int64")
+    return df
+
+
+def write_quarterly_report(df: pd.DataFrame, path, append: bool = False):
+    """Write a quarterly report table.
+
+    Args:
+        append (bool): Add the rows to the table already stored at `path`, if any. Columns missing
+            on either side are filled with missing values.
+    """
+    fmt = storage_format(path)
+    if append and Path(path).exists():
+        df = pd.concat([read_quarterly_report(path), df], ignore_index=True)
+    if fmt == CSV:
+        df.to_csv(path, index=False)
+    elif fmt == PARQUET:
+        with_report_dtypes(df).to_parquet(path, index=False)
+    else:
+        with_report_dtypes(df).reset_index(drop=True).to_feather(path)
+
+
+def read_quarterly_report(path, columns: List[str] = None) -> pd.DataFrame:
+    """Read a quarterly report table.
+
+    Args:
+        columns (List[str]): Only load these columns, plus the `KEY_COLUMNS`. For the columnar
+            formats the other columns are never read from disk.
+    """
+    fmt = storage_format(path)
+    if columns is not None:
+        columns = KEY_COLUMNS + [c for c in columns if c not in KEY_COLUMNS]
+    if fmt == CSV:
+        return pd.read_csv(path, usecols=columns)
+    if fmt == PARQUET:
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_feather(path, columns=columns)
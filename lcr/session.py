@@ -0,0 +1,79 @@
+"""Persist the authenticated LCR cookies between runs.
+
+The `appSession` cookies that the browser login harvests are written to a session file that only
+the current user can read. A later run can load them and skip the browser login entirely while
+they are still valid.
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+SESSION_FILE_MODE = 0o600
+
+
+def save_session(path, cookies: List[Dict]):
+    """Save cookies to a session file readable only by the current user.
+
+    Args:
+        path: The session file to write.
+        cookies (List[Dict]): Cookies in the form selenium's `get_cookies` returns them. Only the
+            `name`, `value` and `expiry` (seconds since the epoch, optional) keys are kept.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    session = [
+        {"name": c["name"], "value": c["value"], "expiry": c.get("expiry")}
+        for c in cookies
+    ]
+    # Create the file with restricted permissions rather than tightening them after the
+    # cookies have already been written.
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, SESSION_FILE_MODE)
+    with os.fdopen(fd, "w") as f:
+        json.dump(session, f)
+    os.chmod(path, SESSION_FILE_MODE)
+    _LOGGER.info(f"Saved session to {path}")
+
+
+def load_session(path, now: float = None) -> Optional[Dict[str, str]]:
+    """Load the cookies of a saved session.
+
+    Returns:
+        Dict[str, str]: The cookie values by name, or `None` if there is no session file, it cannot
+            be parsed or any of its cookies has expired.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    if now is None:
+        now = time.time()
+    try:
+        with open(path) as f:
+            session = json.load(f)
+    except (OSError, ValueError):
+        _LOGGER.warning(f"Ignoring unreadable session file {path}")
+        return None
+    if not session:
+        return None
+    cookies = {}
+    try:
+        for cookie in session:
+            expiry = cookie.get("expiry")
+            if expiry is not None and expiry <= now:
+                _LOGGER.info(f"Saved session in {path} has expired")
+                return None
+            cookies[cookie["name"]] = cookie["value"]
+    except (AttributeError, KeyError, TypeError):
+        _LOGGER.warning(f"Ignoring malformed session file {path}")
+        return None
+    return cookies
+
+
+def delete_session(path):
+    """Remove a session file if it exists."""
+    Path(path).unlink(missing_ok=True)
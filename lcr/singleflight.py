@@ -0,0 +1,60 @@
+"""Coalesce concurrent identical calls into one.
+
+When several threads ask a `SingleFlight` for the same key at once, only the first runs the call.
+The others wait for it and receive the same result, or the same exception. Once the call finishes
+the key is forgotten, so a later call runs again; this deduplicates concurrent work, it does not
+cache results.
+"""
+
+import threading
+from typing import Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        """The number of calls that ran."""
+        self.coalesced = 0
+        """The number of calls that waited for an identical call instead of running."""
+
+    def do(self, key: Hashable, fn: Callable):
+        """Run `fn`, unless a call with the same `key` is already running; then wait for its result."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"calls": self.calls, "coalesced": self.coalesced}
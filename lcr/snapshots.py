@@ -0,0 +1,243 @@
+"""An on disk history of member lists, stored as one baseline plus deltas.
+
+The first member list recorded is saved in full as the baseline. Every later poll only appends a
+`Delta` to a journal: the members added, the ids of those removed and, for members that changed,
+just the fields that changed. Storage grows with how much the ward changes, not with its size.
+
+Any past member list is rebuilt by applying the deltas up to that time to the baseline, and the
+changes since a time are read from the journal alone, without loading any full copy.
+"""
+
+import json
+import logging
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+from lcr.directory import person_id
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Delta:
+    """The changes of a member list between two polls. Member ids are strings."""
+
+    __slots__ = ("taken", "added", "removed", "changed", "dropped")
+
+    def __init__(
+        self,
+        taken: datetime,
+        added: Dict[str, Dict] = None,
+        removed: List[str] = None,
+        changed: Dict[str, Dict] = None,
+        dropped: Dict[str, List[str]] = None,
+    ):
+        """
+        Args:
+            taken (datetime): When the poll with these changes was taken.
+            added (Dict[str, Dict]): The new members, by id.
+            removed (List[str]): The ids of the members that are gone.
+            changed (Dict[str, Dict]): The new value of every changed field, by member id.
+            dropped (Dict[str, List[str]]): Fields that are no longer present, by member id.
+        """
+        self.taken = taken
+        self.added = added or {}
+        self.removed = removed or []
+        self.changed = changed or {}
+        self.dropped = dropped or {}
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed or self.dropped)
+
+    @property
+    def member_ids(self) -> set:
+        """The ids of every member added, removed or changed."""
+        return {*self.added, *self.removed, *self.changed, *self.dropped}
+
+    def apply(self, members: Dict[str, Dict]):
+        """Apply the changes to `members`, a dict of members by id, in place."""
+        for member_id in self.removed:
+            members.pop(member_id, None)
+        for member_id, fields in self.changed.items():
+            members[member_id] = {**members[member_id], **fields}
+        for member_id, fields in self.dropped.items():
+            member = members[member_id] = dict(members[member_id])
+            for field in fields:
+                member.pop(field, None)
+        members.update(self.added)
+
+    def to_dict(self) -> Dict:
+        return {
+            "taken": self.taken.isoformat(),
+            "added": self.added,
+            "removed": self.removed,
+            "changed": self.changed,
+            "dropped": self.dropped,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Delta":
+        return cls(
+            datetime.fromisoformat(data["taken"]),
+            data.get("added"),
+            data.get("removed"),
+            data.get("changed"),
+            data.get("dropped"),
+        )
+
+    def __repr__(self):
+        return (
+            f"Delta({self.taken.isoformat()}, added={len(self.added)}, "
+            f"removed={len(self.removed)}, changed={len(self.changed) + len(self.dropped)})"
+        )
+
+
+def diff_members(old: Dict[str, Dict], new: Dict[str, Dict], taken: datetime) -> Delta:
+    """The `Delta` turning `old` into `new`, both dicts of members by id.
+
+    Only members whose dict differs are compared field by field.
+    """
+    delta = Delta(taken)
+    for member_id, member in new.items():
+        previous = old.get(member_id)
+        if previous is None:
+            delta.added[member_id] = member
+        elif previous != member:
+            changed = {
+                field: value
+                for field, value in member.items()
+                if field not in previous or previous[field] != value
+            }
+            dropped = [field for field in previous if field not in member]
+            if changed:
+                delta.changed[member_id] = changed
+            if dropped:
+                delta.dropped[member_id] = dropped
+    delta.removed = [member_id for member_id in old if member_id not in new]
+    return delta
+
+
+def _as_datetime(value) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(value)
+
+
+def _by_id(members: Iterable[Dict]) -> Dict[str, Dict]:
+    by_id = {}
+    for member in members:
+        member_id = person_id(member)
+        if member_id is None:
+            _LOGGER.warning("Skipping member without an id")
+            continue
+        by_id[str(member_id)] = member
+    return by_id
+
+
+class MemberSnapshotStore:
+    def __init__(self, root):
+        """
+        Args:
+            root: The directory holding the history. It is created if it does not exist.
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._baseline_path = self.root / "baseline.json"
+        self._journal_path = self.root / "deltas.jsonl"
+        self._latest_path = self.root / "latest.json"
+
+    def _write_json(self, path: Path, data):
+        temp_path = path.with_suffix(".json.part")
+        with open(temp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+
+    def _read_json(self, path: Path):
+        with open(path) as f:
+            return json.load(f)
+
+    def _latest(self) -> Dict:
+        """The last recorded member list. It is kept so a poll is diffed without a replay."""
+        if self._latest_path.exists():
+            return self._read_json(self._latest_path)
+        return self._read_json(self._baseline_path)
+
+    def record(self, members: Iterable[Dict], taken: datetime = None) -> Delta:
+        """Record a poll of `API.member_list`.
+
+        The first poll becomes the baseline. Later polls append their changes to the journal, if
+        there are any.
+
+        Args:
+            taken (datetime): When the poll was taken. Defaults to now.
+
+        Returns:
+            Delta: The changes since the previous poll. For the baseline, every member is added.
+        """
+        taken = _as_datetime(taken or datetime.now())
+        members = _by_id(members)
+        if not self._baseline_path.exists():
+            self._write_json(
+                self._baseline_path, {"taken": taken.isoformat(), "members": members}
+            )
+            _LOGGER.info(f"Recorded a baseline of {len(members)} members")
+            return Delta(taken, added=members)
+
+        latest = self._latest()
+        if taken < datetime.fromisoformat(latest["taken"]):
+            raise ValueError(
+                f"Polls must be recorded in order, but {taken} is before the last one"
+            )
+        delta = diff_members(latest["members"], members, taken)
+        if delta:
+            with open(self._journal_path, "a") as f:
+                f.write(json.dumps(delta.to_dict()) + "\n")
+        self._write_json(
+            self._latest_path, {"taken": taken.isoformat(), "members": members}
+        )
+        _LOGGER.info(f"Recorded {delta!r}")
+        return delta
+
+    def deltas(self) -> Iterator[Delta]:
+        """Every recorded delta, oldest first."""
+        if not self._journal_path.exists():
+            return
+        with open(self._journal_path) as f:
+            for line in f:
+                if line.strip():
+                    yield Delta.from_dict(json.loads(line))
+
+    def changes_since(self, since) -> List[Delta]:
+        """The deltas of every poll taken after `since`, a `date`, `datetime` or iso string.
+
+        Only the journal is read.
+        """
+        since = _as_datetime(since)
+        return [delta for delta in self.deltas() if delta.taken > since]
+
+    def snapshot(self, at=None) -> List[Dict]:
+        """The member list as it was at `at`, a `date`, `datetime` or iso string.
+
+        Args:
+            at: Defaults to the last poll. Polls taken after it are not applied.
+
+        Raises:
+            ValueError: There is no baseline yet or `at` is before it.
+        """
+        if not self._baseline_path.exists():
+            raise ValueError(f"No member list was recorded in {self.root}")
+        if at is None:
+            return list(self._latest()["members"].values())
+        at = _as_datetime(at)
+        baseline = self._read_json(self._baseline_path)
+        if at < datetime.fromisoformat(baseline["taken"]):
+            raise ValueError(f"{at} is before the first recorded member list")
+        members = baseline["members"]
+        for delta in self.deltas():
+            if delta.taken > at:
+                break
+            delta.apply(members)
+        return list(members.values())
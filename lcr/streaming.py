@@ -0,0 +1,161 @@
+"""Incremental parsing of large JSON responses.
+
+`iter_json_array` reads a response body chunk by chunk and yields the elements of one JSON array as
+soon as each of them has arrived. Only the element being parsed is held in memory, so records can
+be written or indexed while the rest of the body is still downloading.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator, Union
+
+CHUNK_SIZE = 64 * 1024
+"""The number of bytes read from a streamed response at a time."""
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",:]}"
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_STRING_STRUCTURE = re.compile(r'["\\]')
+
+
+class _Reader:
+    """A buffer over a stream of chunks that drops what has already been parsed."""
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read the next non empty chunk. Returns `False` once the stream is exhausted."""
+        while not self.eof:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self.eof = True
+                text = self._decoder.decode(b"", final=True)
+            elif isinstance(chunk, bytes):
+                text = self._decoder.decode(chunk)
+            else:
+                text = chunk
+            if text:
+                self.buffer = self.buffer[self.pos :] + text
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self) -> str:
+        """The next non whitespace character, without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON")
+
+    def expect(self, character: str):
+        found = self.peek()
+        if found != character:
+            raise ValueError(f"Expected '{character}' but found '{found}'")
+        self.pos += 1
+
+
+_DECODER = json.JSONDecoder()
+
+
+def _read_value(reader: _Reader) -> Any:
+    reader.peek()
+    while True:
+        try:
+            value, end = _DECODER.raw_decode(reader.buffer, reader.pos)
+        except json.JSONDecodeError:
+            if not reader.fill():
+                raise
+            continue
+        # A number cut off by the end of a chunk also decodes, so a value only counts as
+        # complete once the delimiter after it has arrived.
+        if (
+            end == len(reader.buffer) or reader.buffer[end] not in _DELIMITERS
+        ) and reader.fill():
+            continue
+        reader.pos = end
+        return value
+
+
+def _skip_value(reader: _Reader):
+    """Move past a value without building it, so skipped values cost no memory."""
+    if reader.peek() not in '{["':
+        _read_value(reader)
+        return
+    depth = 0
+    in_string = False
+    while True:
+        pattern = _STRING_STRUCTURE if in_string else _STRUCTURE
+        match = pattern.search(reader.buffer, reader.pos)
+        if match is None:
+            reader.pos = len(reader.buffer)
+            if not reader.fill():
+                raise ValueError("Unexpected end of JSON")
+            continue
+        character = match.group()
+        if character == "\\":
+            if match.end() >= len(reader.buffer):
+                # Keep the backslash until the character it escapes has arrived.
+                reader.pos = match.start()
+                if not reader.fill():
+                    raise ValueError("Unexpected end of JSON")
+                continue
+            reader.pos = match.end() + 1
+            continue
+        reader.pos = match.end()
+        if character == '"':
+            in_string = not in_string
+        elif character in "[{":
+            depth += 1
+        else:
+            depth -= 1
+        if depth == 0 and not in_string:
+            return
+
+
+def iter_json_array(chunks: Iterable[Union[bytes, str]], key: str = None) -> Iterator:
+    """Yield the elements of a JSON array one at a time.
+
+    Args:
+        chunks: The body of a JSON document, for example `response.iter_content(chunk_size)`.
+        key (str): When given, the document is an object and the array is its `key` member. The
+            other members are skipped without being parsed. When `None`, the document itself is
+            the array.
+
+    Raises:
+        KeyError: `key` is not a member of the document.
+        ValueError: The document is not valid JSON or does not have the expected shape.
+    """
+    reader = _Reader(chunks)
+    if key is not None:
+        reader.expect("{")
+        while True:
+            if reader.peek() == "}":
+                raise KeyError(key)
+            name = _read_value(reader)
+            reader.expect(":")
+            if name == key:
+                break
+            _skip_value(reader)
+            if reader.peek() == ",":
+                reader.pos += 1
+
+    reader.expect("[")
+    if reader.peek() == "]":
+        return
+    while True:
+        yield _read_value(reader)
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or ']' but found '{separator}'")
@@ -0,0 +1,161 @@
+"""The HTTP transport used by `lcr.api.API`.
+
+`Transport` sends the GET requests of an `API` over its `requests.Session`. It sizes the session's
+connection pool, retries transient failures with exponential backoff and jitter, honors the
+`Retry-After` header and paces requests with a token bucket shared by every method of the `API`
+(and by every `API` the same transport is given to).
+"""
+
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class RateLimiter:
+    """A thread safe token bucket.
+
+    Tokens are added at `rate` per second, up to `burst`. Every request takes one token and waits
+    until one is available.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def retry_after_seconds(response) -> float:
+    """The delay requested by a `Retry-After` header, or `None` if there is none.
+
+    The header is either a number of seconds or an HTTP date.
+    """
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class Transport:
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30,
+        retry_statuses=RETRY_STATUSES,
+        rate_limit: float = None,
+        burst: int = 1,
+    ):
+        """
+        Args:
+            pool_size (int): The most connections kept open to each host. This should be at least
+                the number of requests made concurrently.
+            max_retries (int): How many times a request is retried after a connection error or a
+                response with one of `retry_statuses`.
+            backoff_factor (float): Retry `n` waits a random time up to
+                `backoff_factor * 2 ** n` seconds, capped at `max_backoff`. A `Retry-After` header
+                overrides this.
+            rate_limit (float): The most requests per second. `None` does not limit the rate.
+            burst (int): How many requests may be sent at once before `rate_limit` applies.
+        """
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = frozenset(retry_statuses)
+        self.rate_limiter = RateLimiter(rate_limit, burst) if rate_limit else None
+
+    def mount(self, session: requests.Session):
+        """Size the connection pool of `session` to `pool_size`."""
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size, pool_maxsize=self.pool_size
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+    def _backoff(self, retry: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2**retry))
+
+    def _send(self, session: requests.Session, request: dict, endpoint: str = None):
+        """Send one GET request. Subclasses override this to change how requests are sent."""
+        return session.get(**request)
+
+    def get(self, session: requests.Session, request: dict, endpoint: str = None):
+        """Send a GET request, retrying transient failures.
+
+        Args:
+            request (dict): The keyword arguments for `requests.Session.get`.
+            endpoint (str): The name of the API method making the request.
+
+        Returns:
+            requests.Response: The last response. Its `retries` attribute is the number of retries
+                it took. A response that still has a retry status after the last retry is returned
+                as is for the caller to raise.
+        """
+        retry = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            try:
+                response = self._send(session, request, endpoint)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if retry >= self.max_retries:
+                    raise
+                delay = self._backoff(retry)
+                _LOGGER.warning(
+                    f"Retrying {request['url']} in {delay:.1f}s after {type(e).__name__}"
+                )
+            else:
+                if (
+                    response.status_code not in self.retry_statuses
+                    or retry >= self.max_retries
+                ):
+                    response.retries = retry
+                    return response
+                delay = retry_after_seconds(response)
+                if delay is None:
+                    delay = self._backoff(retry)
+                _LOGGER.warning(
+                    f"Retrying {request['url']} in {delay:.1f}s after status "
+                    f"{response.status_code}"
+                )
+                response.close()
+            time.sleep(delay)
+            retry += 1
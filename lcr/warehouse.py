@@ -0,0 +1,417 @@
+"""A local sqlite warehouse for the data pulled from LCR.
+
+Quarterly reports are stored as one row per unit, quarter and report row (its `nameResourceId`),
+next to tables of members, callings and recommend status. Every table is indexed for the slices
+analytics ask for, so a chart can load the handful of report values it plots instead of the whole
+report table:
+
+    warehouse = Warehouse("analytics/data/warehouse.sqlite")
+    warehouse.sync(api, units)
+    warehouse.quarterly_values(["total.members"], start=Quarter(2022, 1), wide=True)
+
+Writes are bulk upserts, so syncing again only updates what changed. The values of a quarterly
+report, and the members, callings and recommends of a unit, are replaced as a whole, which drops
+the rows and people that are gone. Members are keyed by unit, so syncing units that share members
+keeps them in each.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+from lcr.api import API
+from lcr.quarter import Quarter
+from lcr.quarterly_report import QuarterlyReport
+from lcr.records import iter_callings
+from lcr.unit import Unit
+
+_LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    unit_number INTEGER PRIMARY KEY,
+    name TEXT
+);
+CREATE TABLE IF NOT EXISTS quarterly_values (
+    unit_number INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    quarter INTEGER NOT NULL,
+    resource_id TEXT NOT NULL,
+    section_id TEXT,
+    position INTEGER NOT NULL,
+    actual REAL,
+    potential REAL,
+    PRIMARY KEY (unit_number, year, quarter, resource_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS quarterly_values_resource
+    ON quarterly_values (resource_id, year, quarter);
+CREATE TABLE IF NOT EXISTS members (
+    member_id INTEGER NOT NULL,
+    unit_number INTEGER NOT NULL,
+    mrn TEXT,
+    name TEXT,
+    sex TEXT,
+    age INTEGER,
+    data TEXT NOT NULL,
+    PRIMARY KEY (unit_number, member_id)
+);
+CREATE INDEX IF NOT EXISTS members_id ON members (member_id);
+CREATE INDEX IF NOT EXISTS members_mrn ON members (mrn);
+CREATE TABLE IF NOT EXISTS callings (
+    unit_number INTEGER NOT NULL,
+    position_id INTEGER NOT NULL,
+    member_id INTEGER,
+    member_name TEXT,
+    position TEXT,
+    organization TEXT,
+    sub_org_id INTEGER,
+    active_date TEXT,
+    set_apart INTEGER,
+    data TEXT NOT NULL,
+    PRIMARY KEY (unit_number, position_id)
+);
+CREATE INDEX IF NOT EXISTS callings_member ON callings (member_id);
+CREATE INDEX IF NOT EXISTS callings_organization ON callings (organization);
+CREATE TABLE IF NOT EXISTS recommends (
+    member_id INTEGER NOT NULL,
+    unit_number INTEGER NOT NULL,
+    mrn TEXT,
+    name TEXT,
+    recommend_status TEXT,
+    type TEXT,
+    expiration_date TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (unit_number, member_id)
+);
+CREATE INDEX IF NOT EXISTS recommends_id ON recommends (member_id);
+CREATE INDEX IF NOT EXISTS recommends_status ON recommends (recommend_status);
+"""
+
+WIDE_KEY_COLUMNS = ["year", "quarter.num", "quarter", "unitId", "unitName"]
+"""The identifying columns of `Warehouse.quarterly_values(wide=True)`, like the report table."""
+
+
+def _number(value):
+    """A report value as a number, or `None` if it is missing or not numeric."""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Warehouse:
+    def __init__(self, path):
+        """
+        Args:
+            path: The sqlite file of the warehouse. It is created if it does not exist.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _replace_unit_rows(self, table: str, unit_number, sql: str, rows: List[tuple]):
+        """Replace the rows of one unit in `table` with `rows` in a single transaction."""
+        with self._lock, self._db:
+            self._db.execute(
+                f"DELETE FROM {table} WHERE unit_number = ?", (unit_number,)
+            )
+            self._db.executemany(sql, rows)
+        _LOGGER.info(f"Stored {len(rows)} {table} of unit {unit_number}")
+
+    def upsert_units(self, units: Iterable[Unit]):
+        rows = [(unit.number, unit.name) for unit in units]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO units VALUES (?, ?) "
+                "ON CONFLICT (unit_number) DO UPDATE SET name = excluded.name",
+                rows,
+            )
+
+    def upsert_quarterly_reports(self, reports: Iterable[Tuple[int, Quarter, dict]]):
+        """Store quarterly reports, replacing the stored values of the same unit and quarter.
+
+        Rows missing from a new report are removed along with the rest of the old values.
+
+        Args:
+            reports: `(unit number, quarter, report)` triples, where the report is the result of
+                `API.quarterly_report` or a `QuarterlyReport` of it.
+        """
+        replaced = []
+        rows = []
+        for unit_number, quarter, qrp in reports:
+            replaced.append((unit_number, quarter.year, quarter.quarter))
+            fields = QuarterlyReport.of(qrp).fields()
+            for position, (section_id, row_id, actual, potential) in enumerate(fields):
+                rows.append(
+                    (
+                        unit_number,
+                        quarter.year,
+                        quarter.quarter,
+                        row_id,
+                        section_id,
+                        position,
+                        _number(actual),
+                        _number(potential),
+                    )
+                )
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM quarterly_values "
+                "WHERE unit_number = ? AND year = ? AND quarter = ?",
+                replaced,
+            )
+            self._db.executemany(
+                "INSERT INTO quarterly_values VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (unit_number, year, quarter, resource_id) DO UPDATE SET "
+                "section_id = excluded.section_id, position = excluded.position, "
+                "actual = excluded.actual, potential = excluded.potential",
+                rows,
+            )
+        _LOGGER.info(f"Stored {len(rows)} quarterly report values")
+
+    def upsert_members(self, unit_number, members: Iterable[Dict]):
+        """Replace the stored members of a unit with the result of `API.member_list`."""
+        rows = [
+            (
+                member.get("legacyCmisId"),
+                unit_number,
+                member.get("mrn"),
+                member.get("nameListPreferredLocal"),
+                member.get("sex"),
+                member.get("age"),
+                json.dumps(member),
+            )
+            for member in members
+            if member.get("legacyCmisId") is not None
+        ]
+        self._replace_unit_rows(
+            "members",
+            unit_number,
+            "INSERT OR REPLACE INTO members VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def upsert_callings(self, unit_number, organizations: Iterable[Dict]):
+        """Replace the stored callings of a unit with the result of `API.callings`."""
+        rows = [
+            (
+                unit_number,
+                calling.get("positionId"),
+                calling.get("memberId"),
+                calling.get("memberName"),
+                calling.get("position"),
+                calling.get("organization"),
+                calling.get("subOrgId"),
+                calling.get("activeDate"),
+                calling.get("setApart"),
+                json.dumps(calling),
+            )
+            for calling in iter_callings(organizations)
+            if calling.get("positionId") is not None
+        ]
+        self._replace_unit_rows(
+            "callings",
+            unit_number,
+            "INSERT OR REPLACE INTO callings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def upsert_recommends(self, unit_number, recommends: Iterable[Dict]):
+        """Replace the stored recommend status of a unit with the result of
+        `API.recommend_status`."""
+        rows = [
+            (
+                recommend.get("id"),
+                unit_number,
+                recommend.get("mrn"),
+                recommend.get("name"),
+                recommend.get("recommendStatus"),
+                recommend.get("type"),
+                recommend.get("expirationDate"),
+                json.dumps(recommend),
+            )
+            for recommend in recommends
+            if recommend.get("id") is not None
+        ]
+        self._replace_unit_rows(
+            "recommends",
+            unit_number,
+            "INSERT OR REPLACE INTO recommends VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def stored_quarters(self) -> set:
+        """The `(unit number, Quarter)` of every stored quarterly report."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT unit_number, year, quarter FROM quarterly_values"
+            ).fetchall()
+        return {
+            (unit_number, Quarter(year, quarter)) for unit_number, year, quarter in rows
+        }
+
+    def sync(
+        self,
+        api: API,
+        units: List[Unit],
+        quarterly_reports: bool = True,
+        members: bool = True,
+        max_workers: int = 8,
+    ):
+        """Pull the data of `units` from LCR into the warehouse.
+
+        Quarterly reports of closed quarters that are already stored are not fetched again. The
+        callings are only available for the unit of `api`.
+
+        Args:
+            quarterly_reports (bool): Sync the quarterly reports.
+            members (bool): Sync the members, recommend status and callings.
+            max_workers (int): The number of requests in flight at once.
+        """
+        self.upsert_units(units)
+        if quarterly_reports:
+            stored = self.stored_quarters()
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                unit_quarters = list(executor.map(api.available_report_quarters, units))
+                jobs = [
+                    (unit.number, quarter)
+                    for unit, quarters in zip(units, unit_quarters)
+                    for quarter in quarters
+                    if (unit.number, quarter) not in stored or not quarter.is_closed()
+                ]
+                reports = executor.map(
+                    lambda job: api.quarterly_report(
+                        job[0], job[1].quarter, job[1].year
+                    ),
+                    jobs,
+                )
+                self.upsert_quarterly_reports(
+                    (unit_number, quarter, qrp)
+                    for (unit_number, quarter), qrp in zip(jobs, reports)
+                )
+        if members:
+            results = api.for_units(
+                units, ["member_list", "recommend_status"], max_workers=max_workers
+            )
+            for unit_number, result in results.items():
+                self.upsert_members(unit_number, result["member_list"])
+                self.upsert_recommends(unit_number, result["recommend_status"])
+            self.upsert_callings(api.unit_number, api.callings())
+
+    def query(self, sql: str, params=()) -> pd.DataFrame:
+        """Run any query against the warehouse."""
+        with self._lock:
+            return pd.read_sql_query(sql, self._db, params=params)
+
+    def quarterly_values(
+        self,
+        resource_ids: List[str] = None,
+        unit_numbers: List[int] = None,
+        start: Quarter = None,
+        end: Quarter = None,
+        wide: bool = False,
+    ) -> pd.DataFrame:
+        """Load a slice of the quarterly report values.
+
+        Args:
+            resource_ids (List[str]): Only these report rows. Defaults to every row.
+            unit_numbers (List[int]): Only these units. Defaults to every unit.
+            start (Quarter): The first quarter to load.
+            end (Quarter): The last quarter to load.
+            wide (bool): Return one row per unit and quarter with a column per report row and a
+                `<resource id>.potential` column for its potential, like the quarterly report
+                table written by `lcr.quarterly_report`. Otherwise one row per value with the
+                columns `unit_number`, `unit_name`, `year`, `quarter`, `resource_id`,
+                `section_id`, `actual` and `potential`.
+        """
+        conditions = []
+        params = []
+        for column, values in (
+            ("v.resource_id", resource_ids),
+            ("v.unit_number", unit_numbers),
+        ):
+            if values is not None:
+                conditions.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if start is not None:
+            conditions.append("v.year * 4 + v.quarter - 1 >= ?")
+            params.append(start.index)
+        if end is not None:
+            conditions.append("v.year * 4 + v.quarter - 1 <= ?")
+            params.append(end.index)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        df = self.query(
+            "SELECT v.unit_number, u.name AS unit_name, v.year, v.quarter, v.resource_id, "
+            "v.section_id, v.position, v.actual, v.potential "
+            "FROM quarterly_values v LEFT JOIN units u USING (unit_number) "
+            f"{where} ORDER BY v.unit_number, v.year, v.quarter, v.position",
+            params,
+        )
+        if not wide:
+            return df.drop(columns="position")
+        return _widen(df)
+
+    def members(self, unit_number: int = None) -> pd.DataFrame:
+        return self._unit_table("members", unit_number)
+
+    def callings(
+        self, unit_number: int = None, organization: str = None
+    ) -> pd.DataFrame:
+        return self._unit_table("callings", unit_number, organization=organization)
+
+    def recommends(self, unit_number: int = None, status: str = None) -> pd.DataFrame:
+        return self._unit_table("recommends", unit_number, recommend_status=status)
+
+    def _unit_table(self, table: str, unit_number=None, **filters) -> pd.DataFrame:
+        filters["unit_number"] = unit_number
+        conditions = [f"{column} = ?" for column, v in filters.items() if v is not None]
+        params = [v for v in filters.values() if v is not None]
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self.query(f"SELECT * FROM {table} {where}", params)
+
+
+def _widen(df: pd.DataFrame) -> pd.DataFrame:
+    """Pivot long quarterly values into the layout of the quarterly report table."""
+    if df.empty:
+        return pd.DataFrame(columns=WIDE_KEY_COLUMNS)
+    df = df.assign(unit_name=df["unit_name"].fillna(""))
+    order = df.groupby("resource_id", sort=False)["position"].min().sort_values().index
+    wide = df.set_index(["year", "quarter", "unit_number", "unit_name", "resource_id"])[
+        ["actual", "potential"]
+    ].unstack("resource_id")
+    columns = {}
+    for resource_id in order:
+        columns[resource_id] = wide[("actual", resource_id)]
+        columns[f"{resource_id}.potential"] = wide[("potential", resource_id)]
+    values = pd.DataFrame(columns, index=wide.index).reset_index()
+    values = values.sort_values(["unit_number", "year", "quarter"], kind="stable")
+    keys = pd.DataFrame(
+        {
+            "year": values["year"],
+            "quarter.num": values["quarter"],
+            "quarter": [
+                str(Quarter(int(y), int(q)))
+                for y, q in zip(values["year"], values["quarter"])
+            ],
+            "unitId": values["unit_number"],
+            "unitName": values["unit_name"],
+        }
+    )
+    data = values.drop(columns=["year", "quarter", "unit_number", "unit_name"])
+    return pd.concat([keys, data], axis=1).reset_index(drop=True)
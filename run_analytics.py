@@ -1,12 +1,13 @@
 import json
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-
 from analytics.data import *
+from analytics.rendering import DashboardRenderer, ParallelRenderer
 from analytics.stake_quarterlies import create_quarterly_analytics
 from lcr import quarterly_report, unit
-from lcr.api import API, CHROME_OPTIONS
+from lcr.api import API
+from lcr.cache import ResponseCache
+from lcr.metrics import RequestMetrics
+from lcr.transport import DEFAULT_POOL_SIZE, Transport
 
 
 def load_profile():
@@ -15,38 +16,58 @@ def load_profile():
     return profile
 
 
-def setup_api_from_profile(profile) -> API:
-    if profile["chrome_driver_path"]:
-        driver = webdriver.Chrome(
-            service=Service(profile["chrome_driver_path"]), options=CHROME_OPTIONS
-        )
-        api = API(
-            profile["username"],
-            profile["password"],
-            profile["unit_number"],
-            driver=driver,
-        )
-    else:
-        api = API(profile["username"], profile["password"], profile["unit_number"])
+def setup_api_from_profile(profile, hooks=None) -> API:
+    cache = None
+    if profile.get("cache_path"):
+        cache = ResponseCache(profile["cache_path"])
+    transport = Transport(
+        pool_size=max(DEFAULT_POOL_SIZE, profile.get("max_workers", 1)),
+        rate_limit=profile.get("rate_limit"),
+    )
+    api = API(
+        profile["username"],
+        profile["password"],
+        profile["unit_number"],
+        cache=cache,
+        session_file=profile.get("session_path"),
+        chrome_driver_path=profile.get("chrome_driver_path"),
+        transport=transport,
+        hooks=hooks,
+    )
     return api
 
 
 def download_units_data(profile) -> str:
     """Downloads the units data based on units listed in the `profile`."""
     units = unit.load_units(profile["units"])
-    api = setup_api_from_profile(profile)
-    reporter = quarterly_report.HistoricalQuarterlyReport(api, units)
-    output_file = create_and_get_output_path(f"{profile['unit_name']}.csv")
-    reporter.download_historical_quarters_to_csv(units, output_file)
+    metrics = RequestMetrics() if profile.get("metrics_path") else None
+    api = setup_api_from_profile(profile, hooks=[metrics] if metrics else None)
+    reporter = quarterly_report.HistoricalQuarterlyReport(
+        api, units, max_workers=profile.get("max_workers", 1)
+    )
+    output_format = profile.get("output_format", "csv")
+    output_file = create_and_get_output_path(f"{profile['unit_name']}.{output_format}")
+    reporter.download_historical_quarters(
+        units, output_file, incremental=profile.get("incremental", False)
+    )
+    if metrics:
+        print(metrics.summary_table())
+        metrics.save(profile["metrics_path"])
     return output_file
 
 
 def main():
     profile = load_profile()
-    download_units_data(profile)
+    data_file = download_units_data(profile)
     start_year = 2022
+    renderer = None
+    if profile.get("dashboard"):
+        dashboard_file = create_and_get_output_path(f"{profile['unit_name']}.html")
+        renderer = DashboardRenderer(dashboard_file, title=profile["unit_name"])
+    elif profile.get("render_workers"):
+        renderer = ParallelRenderer(max_workers=profile["render_workers"])
     create_quarterly_analytics(
-        f"analytics\data\{profile['unit_name']}.csv", start_year, profile["unit_name"]
+        data_file, start_year, profile["unit_name"], renderer=renderer
     )
 
 
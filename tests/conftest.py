@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from lcr.api import LCR_DOMAIN
+from lcr.replay import save_recording
+
+UNIT_NUMBER = 12345
+MEMBER_LIST_URL = f"https://{LCR_DOMAIN}/api/umlu/report/member-list"
+MEMBER_LIST = [{"legacyCmisId": 1, "nameListPreferredLocal": "Doe, Jane"}]
+
+
+def report(*rows):
+    """A quarterly report with one section holding `(name, actual, potential)` rows."""
+    return {
+        "sections": [
+            {
+                "nameResourceId": "section",
+                "rows": [
+                    {
+                        "nameResourceId": name,
+                        "actualValue": actual,
+                        "potentialValue": potential,
+                    }
+                    for name, actual, potential in rows
+                ],
+            }
+        ]
+    }
+
+
+@pytest.fixture
+def recordings(tmp_path):
+    """A directory with a recorded `member_list` of `UNIT_NUMBER`, for `ReplayTransport`."""
+    save_recording(
+        tmp_path,
+        "member_list",
+        MEMBER_LIST_URL,
+        {"lang": "eng", "unitNumber": UNIT_NUMBER},
+        200,
+        json.dumps(MEMBER_LIST).encode("utf-8"),
+        {"Content-Type": "application/json"},
+    )
+    return tmp_path
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from lcr.async_api import AsyncAPI
+from lcr.quarter import Quarter
+from lcr.unit import Unit
+from tests.conftest import UNIT_NUMBER
+
+PHOTO = b"\x89PNG\r\n\x1a\n"
+
+
+def lcr_app():
+    """A stand in for LCR that echoes what it was asked for."""
+
+    async def member_list(request):
+        return web.json_response(
+            [
+                {
+                    "unitNumber": int(request.query["unitNumber"]),
+                    "cookie": request.cookies.get("appSession"),
+                }
+            ]
+        )
+
+    async def quarters(request):
+        return web.json_response(["2024-1", "2024-2"])
+
+    async def quarterly_report(request):
+        return web.json_response(dict(request.query))
+
+    async def individual_photo(request):
+        url = request.url.with_path(f"/photos/{request.match_info['member_id']}")
+        return web.json_response({"tokenUrl": str(url)})
+
+    async def photo(request):
+        return web.Response(body=PHOTO, content_type="image/png")
+
+    async def recommend_status(request):
+        raise web.HTTPForbidden()
+
+    app = web.Application()
+    app.router.add_get("/api/umlu/report/member-list", member_list)
+    app.router.add_get("/api/report/quarterly-report/quarters", quarters)
+    app.router.add_get("/api/report/quarterly-report", quarterly_report)
+    app.router.add_get("/individual-photo/{member_id}", individual_photo)
+    app.router.add_get("/photos/{member_id}", photo)
+    app.router.add_get("/api/recommend/recommend-status", recommend_status)
+    return app
+
+
+def run(test):
+    """Run `test(lcr)` against a local server with an `AsyncAPI` pointed at it."""
+
+    async def main():
+        async with TestServer(lcr_app()) as server:
+            root_url = str(server.make_url(""))
+            async with AsyncAPI(
+                {"appSession": "abc"}, UNIT_NUMBER, root_url=root_url
+            ) as lcr:
+                return await test(lcr)
+
+    return asyncio.run(main())
+
+
+class TestAsyncAPI:
+    def test_member_list_DefaultsToUnitOfApi(self):
+        async def test(lcr):
+            return await lcr.member_list(), await lcr.member_list(unit_number=67890)
+
+        own, other = run(test)
+        assert own == [{"unitNumber": UNIT_NUMBER, "cookie": "abc"}]
+        assert other[0]["unitNumber"] == 67890
+
+    def test_unit_quarterly_reports_ReturnsReportsInOrder(self):
+        async def test(lcr):
+            return await lcr.unit_quarterly_reports(Unit("Ward", UNIT_NUMBER))
+
+        reports = run(test)
+        assert [quarter for quarter, _ in reports] == [
+            Quarter(2024, 1),
+            Quarter(2024, 2),
+        ]
+        assert [report["quarter"] for _, report in reports] == ["1", "2"]
+        assert reports[0][1]["populateLabels"] == "True"
+
+    def test_individual_photo_ReturnsBytes(self):
+        assert run(lambda lcr: lcr.individual_photo(7)) == PHOTO
+
+    def test_error_status_Throws(self):
+        with pytest.raises(aiohttp.ClientResponseError) as e:
+            run(lambda lcr: lcr.recommend_status())
+        assert e.value.status == 403
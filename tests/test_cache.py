@@ -0,0 +1,132 @@
+import time
+
+import pytest
+
+from lcr.api import API, LCR_DOMAIN
+from lcr.cache import BYPASS, REFRESH, CachedResponse, ResponseCache, make_key
+from lcr.replay import ReplayTransport, build_response, save_recording
+from tests.conftest import UNIT_NUMBER
+
+
+def response(body: bytes):
+    return CachedResponse("https://example.com", 200, body)
+
+
+class TestCache:
+    def test_make_key_IgnoresParameterOrder(self):
+        first = make_key("https://example.com", {"b": 2, "a": True})
+        second = make_key("https://example.com", {"a": True, "b": 2})
+        assert first == second
+
+    def test_make_key_SeparatesHosts(self):
+        url = "https://example.com"
+        assert make_key(url, host="beta.example.com") != make_key(url)
+        assert make_key(url, host="a") != make_key(url, host="b")
+
+    def test_api_BetaDoesNotShareProductionEntries(self, recordings):
+        cache = ResponseCache(recordings / "cache.sqlite", ttls={"member_list": 60})
+        production = API.from_cookies(
+            {}, UNIT_NUMBER, cache=cache, transport=ReplayTransport(recordings)
+        )
+        beta = API.from_cookies(
+            {},
+            UNIT_NUMBER,
+            beta=True,
+            cache=cache,
+            transport=ReplayTransport(recordings),
+        )
+        production.member_list()
+        beta.member_list()
+        assert beta.request_stats()["cache_hits"] == 0
+        production.member_list()
+        assert production.request_stats()["cache_hits"] == 1
+
+    def test_api_DoesNotCacheNonJsonResponse(self, tmp_path):
+        url = f"https://{LCR_DOMAIN}/api/report/quarterly-report"
+        params = {
+            "lang": "eng",
+            "unitNumber": 1,
+            "populateLabels": True,
+            "quarter": 1,
+            "year": 2020,
+        }
+
+        def record(body, content_type):
+            save_recording(
+                tmp_path,
+                "quarterly_report",
+                url,
+                params,
+                200,
+                body,
+                {"Content-Type": content_type},
+            )
+
+        cache = ResponseCache(tmp_path / "cache.sqlite")
+        api = API.from_cookies(
+            {}, UNIT_NUMBER, cache=cache, transport=ReplayTransport(tmp_path)
+        )
+        record(b"<html>Sign in</html>", "text/html")
+        with pytest.raises(ValueError):
+            api.quarterly_report(1, 1, 2020)
+        record(b'{"sections": []}', "application/json")
+        assert api.quarterly_report(1, 1, 2020) == {"sections": []}
+        assert api.quarterly_report(1, 1, 2020) == {"sections": []}
+        assert api.request_stats()["cache_hits"] == 1
+
+    def test_api_DoesNotCacheRedirectedResponse(self, recordings):
+        class RedirectingTransport(ReplayTransport):
+            def _send(self, session, request, endpoint=None):
+                response = super()._send(session, request, endpoint)
+                response.history = [build_response(request["url"], 302, b"")]
+                return response
+
+        cache = ResponseCache(recordings / "cache.sqlite", ttls={"member_list": 60})
+        api = API.from_cookies(
+            {}, UNIT_NUMBER, cache=cache, transport=RedirectingTransport(recordings)
+        )
+        api.member_list()
+        api.member_list()
+        assert api.request_stats()["cache_hits"] == 0
+
+    def test_get_ReturnsStoredResponse(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite")
+        cache.set("key", "access_table", response(b'{"a": 1}'))
+        assert cache.get("key").json() == {"a": 1}
+
+    def test_set_IgnoresUncachedEndpoint(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite")
+        cache.set("key", "member_list", response(b"[]"))
+        assert cache.get("key") is None
+
+    def test_get_ExpiredEntryIsMissing(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite", ttls={"access_table": 0})
+        cache.set("key", "access_table", response(b"{}"))
+        time.sleep(0.01)
+        assert cache.get("key") is None
+
+    def test_get_ImmutableEntryNeverExpires(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite", ttls={"access_table": 0})
+        cache.set("key", "access_table", response(b"{}"), immutable=True)
+        assert cache.get("key") is not None
+
+    def test_set_EvictsLeastRecentlyUsed(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite", max_bytes=10)
+        cache.set("old", "access_table", response(b"123456"))
+        cache.set("new", "access_table", response(b"123456"))
+        assert cache.get("old") is None
+        assert cache.get("new") is not None
+
+    def test_mode_RefreshSkipsReads(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite")
+        cache.set("key", "access_table", response(b"{}"))
+        cache.mode = REFRESH
+        assert cache.get("key") is None
+
+    def test_mode_BypassCachesNothing(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite", mode=BYPASS)
+        assert not cache.caches("access_table")
+
+    def test_mode_InvalidModeThrowsValueError(self, tmp_path):
+        with pytest.raises(ValueError):
+            ResponseCache(tmp_path / "cache.sqlite", mode="BADMODE")
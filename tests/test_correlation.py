@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from analytics.correlation import block_corr, grouped_block_corr, rolling_block_corr
+
+
+def frame():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({f"c{i}": rng.normal(1000 * i, 10 + i, 40) for i in range(5)})
+    df.loc[rng.random(40) < 0.3, "c1"] = np.nan
+    df.loc[0, "c2"] = np.inf
+    df["constant"] = 5.0
+    df["counts"] = pd.array(rng.integers(0, 10, 40), dtype="Int64")
+    df.loc[3, "counts"] = pd.NA
+    return df
+
+
+class TestBlockCorr:
+    def test_block_corr_MatchesPandas(self):
+        df = frame()
+        rows, columns = ["c0", "c1", "constant"], list(df.columns)
+        for min_periods in (1, 30, 40):
+            expected = df.corr(min_periods=min_periods).loc[rows, columns]
+            actual = block_corr(df, rows, columns, min_periods)
+            np.testing.assert_allclose(
+                actual.to_numpy(), expected.to_numpy(), atol=1e-12
+            )
+
+    def test_grouped_block_corr_IsPerGroup(self):
+        df = frame().assign(unit=["a", "b"] * 20)
+        blocks = grouped_block_corr(df, "unit", ["c0"], ["c3", "c4"])
+        subset = df[df["unit"] == "b"]
+        expected = subset[["c0", "c3", "c4"]].corr().loc[["c0"], ["c3", "c4"]]
+        np.testing.assert_allclose(blocks.loc["b"].to_numpy(), expected.to_numpy())
+
+    def test_rolling_block_corr_UsesTrailingQuarters(self):
+        df = frame().assign(year=2024, **{"quarter.num": [1, 2, 3, 4] * 10})
+        df["quarter"] = "2024-Q" + df["quarter.num"].astype(str)
+        blocks = rolling_block_corr(df, ["c0"], ["c3"], window=2)
+        assert list(blocks.index.get_level_values(0)) == [
+            f"2024-Q{q}" for q in range(1, 5)
+        ]
+        subset = df[df["quarter.num"].isin([2, 3])]
+        expected = subset["c0"].corr(subset["c3"])
+        assert np.isclose(blocks.loc[("2024-Q3", "c0"), "c3"], expected)
@@ -0,0 +1,88 @@
+from lcr.directory import MemberDirectory, normalize_name
+
+MEMBERS = [
+    {
+        "legacyCmisId": 1,
+        "mrn": "000-1111-2222",
+        "unitNumber": 10,
+        "nameListPreferredLocal": "Doe, Jane",
+    },
+    {
+        "legacyCmisId": 2,
+        "mrn": "000-3333-4444",
+        "unitNumber": 20,
+        "nameListPreferredLocal": "Smith, José",
+    },
+]
+CALLINGS = [
+    {
+        "name": "Relief Society",
+        "callings": [
+            {"memberId": 1, "position": "President"},
+            {"memberId": 98, "mrn": "000-3333-4444", "position": "Secretary"},
+        ],
+        "children": [],
+    }
+]
+MINISTERING = {
+    "reliefSociety": [
+        {
+            "companionships": [
+                {
+                    "ministers": [{"legacyCmisId": 1}],
+                    "assignments": [{"legacyCmisId": 2}],
+                }
+            ]
+        }
+    ]
+}
+RECOMMENDS = [{"id": 99, "mrn": "00033334444", "recommendStatus": "ACTIVE"}]
+
+
+class FakeAPI:
+    """Each ministering response also holds the other organization, empty, like LCR."""
+
+    def member_list(self):
+        return MEMBERS
+
+    def callings(self):
+        return CALLINGS
+
+    def ministering(self, organization):
+        if organization == "EQ":
+            return {"elders": MINISTERING["reliefSociety"], "reliefSociety": []}
+        return {"elders": [], "reliefSociety": []}
+
+    def recommend_status(self):
+        return RECOMMENDS
+
+
+def directory():
+    return MemberDirectory(
+        MEMBERS, callings=CALLINGS, ministering=MINISTERING, recommends=RECOMMENDS
+    )
+
+
+class TestDirectory:
+    def test_normalize_name_IgnoresOrderCaseAndAccents(self):
+        assert normalize_name("Smith, José") == normalize_name("jose SMITH")
+
+    def test_lookups(self):
+        members = directory()
+        assert members.get(1) is MEMBERS[0]
+        assert members.by_mrn("00011112222") is MEMBERS[0]
+        assert members.in_unit(20) == [MEMBERS[1]]
+        assert members.find("Jose Smith") == [MEMBERS[1]]
+
+    def test_joins(self):
+        members = directory()
+        assert members.callings_of(1)[0]["position"] == "President"
+        assert members.assignments_of(1) == [{"legacyCmisId": 2}]
+        assert members.ministers_of(2) == [{"legacyCmisId": 1}]
+        assert members.recommend_of(2) is RECOMMENDS[0]
+        assert members.recommend_of(1) is None
+        assert members.callings_of(2)[0]["position"] == "Secretary"
+
+    def test_from_api_KeepsEveryOrganizationsMinistering(self):
+        members = MemberDirectory.from_api(FakeAPI())
+        assert members.assignments_of(1) == [{"legacyCmisId": 2}]
@@ -0,0 +1,45 @@
+import importlib
+import sys
+
+import pytest
+
+from tests.conftest import UNIT_NUMBER
+
+BROWSER_MODULES = [
+    "selenium",
+    "selenium.webdriver",
+    "selenium.webdriver.chrome.options",
+    "webdriver_manager",
+    "webdriver_manager.chrome",
+]
+MODULES = ["lcr.api", "lcr.quarterly_report", "analytics.stake_quarterlies"]
+
+
+class TestWithoutSelenium:
+    @pytest.fixture
+    def without_selenium(self, monkeypatch):
+        """Make selenium and webdriver_manager fail to import, and re-import `MODULES` fresh.
+
+        The modules imported by other tests are put back afterwards.
+        """
+        for name in MODULES:
+            module = importlib.import_module(name)
+            package, _, attribute = name.rpartition(".")
+            monkeypatch.setattr(sys.modules[package], attribute, module)
+            monkeypatch.delitem(sys.modules, name)
+        for name in BROWSER_MODULES:
+            monkeypatch.setitem(sys.modules, name, None)
+        return {name: importlib.import_module(name) for name in MODULES}
+
+    def test_import_DoesNotNeedSelenium(self, without_selenium):
+        with pytest.raises(ImportError):
+            import selenium
+        assert without_selenium["lcr.quarterly_report"].QuarterlyReport
+        assert without_selenium["analytics.stake_quarterlies"].STANDARDS_2024
+
+    def test_from_cookies_DoesNotNeedSelenium(self, without_selenium):
+        api_module = without_selenium["lcr.api"]
+        api = api_module.API.from_cookies({"appSession.0": "abc"}, UNIT_NUMBER)
+        assert api.session.cookies["appSession.0"] == "abc"
+        with pytest.raises(ImportError):
+            api_module.chrome_options()
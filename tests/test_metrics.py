@@ -0,0 +1,50 @@
+import json
+
+import pytest
+import requests
+
+from lcr.api import API
+from lcr.metrics import HIT, MISS, RequestEvent, RequestMetrics
+from lcr.replay import ReplayTransport
+from tests.conftest import MEMBER_LIST, UNIT_NUMBER
+
+
+class TestRequestMetrics:
+    def test_hooks_ReceiveEveryRequest(self, recordings):
+        metrics = RequestMetrics(keep_events=True)
+        transport = ReplayTransport(recordings, error_rate=0.5, seed=1, max_retries=20)
+        transport.backoff_factor = 0
+        api = API.from_cookies({}, UNIT_NUMBER, transport=transport, hooks=[metrics])
+        api.member_list()
+        api.member_list()
+        event, _ = metrics.events
+        assert event.endpoint == "member_list"
+        assert event.status == 200
+        assert event.bytes == len(json.dumps(MEMBER_LIST))
+        member_list = metrics.endpoint("member_list")
+        assert member_list.requests == 2
+        assert member_list.retries == sum(e.retries for e in metrics.events)
+
+    def test_hooks_ReceiveFailedRequests(self, recordings):
+        metrics = RequestMetrics()
+        transport = ReplayTransport(recordings, error_rate=1, max_retries=0)
+        api = API.from_cookies({}, UNIT_NUMBER, transport=transport, hooks=[metrics])
+        with pytest.raises(requests.HTTPError):
+            api.member_list()
+        assert metrics.endpoint("member_list").errors == 1
+
+    def test_summary_AggregatesPerEndpoint(self):
+        metrics = RequestMetrics()
+        metrics(RequestEvent("a", "url", 200, 0.02, bytes=10, cache=MISS))
+        metrics(RequestEvent("a", "url", 200, 0.001, bytes=10, cache=HIT))
+        metrics(RequestEvent("b", "url", None, 0.5, error="ConnectionError"))
+        summary = {m["endpoint"]: m for m in metrics.summary()}
+        assert summary["a"]["requests"] == 2
+        assert summary["a"]["bytes"] == 20
+        assert (summary["a"]["cache_hits"], summary["a"]["cache_misses"]) == (1, 1)
+        assert summary["a"]["histogram"]["le_0.01"] == 1
+        assert summary["a"]["histogram"]["le_0.025"] == 1
+        assert summary["b"]["errors"] == 1
+        assert [m["endpoint"] for m in metrics.summary()] == ["b", "a"]
+        assert json.loads(metrics.to_json())["endpoints"] == metrics.summary()
+        assert metrics.summary_table().splitlines()[1].startswith("b ")
@@ -0,0 +1,84 @@
+import hashlib
+import json
+
+import pytest
+
+from lcr.api import API, LCR_DOMAIN
+from lcr.photos import PhotoStore
+from lcr.replay import ReplayTransport, save_recording
+from tests.conftest import UNIT_NUMBER
+
+PHOTO = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 10
+PHOTO_PARAMS = {"lang": "eng", "status": "APPROVED"}
+
+
+def photo_url(member_id):
+    return f"https://{LCR_DOMAIN}/individual-photo/{member_id}"
+
+
+def token_url(member_id):
+    return f"https://photos.example.org/{member_id}.png?token=abc"
+
+
+def record_photo(directory, member_id, content=PHOTO, status=200):
+    save_recording(
+        directory,
+        "individual_photo",
+        photo_url(member_id),
+        PHOTO_PARAMS,
+        200,
+        json.dumps({"tokenUrl": token_url(member_id)}).encode("utf-8"),
+    )
+    save_recording(
+        directory, "photo_content", token_url(member_id), None, status, content
+    )
+
+
+@pytest.fixture
+def photos(tmp_path):
+    """Members 1 and 4 share a photo, 2 has no approved photo and the photo of 3 is gone."""
+    directory = tmp_path / "recordings"
+    record_photo(directory, 1)
+    record_photo(directory, 4)
+    save_recording(directory, "individual_photo", photo_url(2), PHOTO_PARAMS, 404, b"")
+    record_photo(directory, 3, content=b"", status=404)
+    return directory
+
+
+def replay_api(directory):
+    return API.from_cookies({}, UNIT_NUMBER, transport=ReplayTransport(directory))
+
+
+class TestPhotoStore:
+    def test_write_StoresPhotosByContent(self, tmp_path):
+        store = PhotoStore(tmp_path)
+        photo_hash = store.write(1, [PHOTO[:100], PHOTO[100:]])
+        assert store.write(2, [PHOTO]) == photo_hash
+        assert photo_hash == hashlib.sha256(PHOTO).hexdigest()
+        assert store.path_for(photo_hash).read_bytes() == PHOTO
+        assert store.read(2) == PHOTO
+        assert store.read(3) is None
+        assert list((tmp_path / "objects").glob("*/*")) == [store.path_for(photo_hash)]
+
+    def test_save_PersistsIndex(self, tmp_path):
+        store = PhotoStore(tmp_path)
+        photo_hash = store.write(1, [PHOTO])
+        store.save()
+        assert PhotoStore(tmp_path).index() == {"1": photo_hash}
+
+
+class TestDownloadPhotos:
+    def test_download_photos_StoresPhotos(self, photos, tmp_path):
+        store = PhotoStore(tmp_path / "photos")
+        hashes = replay_api(photos).download_photos([1, 2, 3, 4], store)
+        photo_hash = hashlib.sha256(PHOTO).hexdigest()
+        assert hashes == {"1": photo_hash, "2": None, "3": None, "4": photo_hash}
+        assert store.read(4) == PHOTO
+        assert PhotoStore(tmp_path / "photos").has(1)
+
+    def test_download_photos_SkipsStoredPhotos(self, photos, tmp_path):
+        store = PhotoStore(tmp_path / "photos")
+        first = replay_api(photos).download_photos([1, 4], store)
+        # Nothing is recorded here, so any request would fail.
+        empty = tmp_path / "empty"
+        assert replay_api(empty).download_photos([1, 4], store) == first
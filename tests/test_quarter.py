@@ -0,0 +1,60 @@
+import pickle
+from datetime import date
+
+import pytest
+
+from lcr.quarter import Quarter, quarter_is_closed
+
+
+class TestQuarter:
+    def test_init_ParsesBothFormats(self):
+        assert Quarter("2023-1") == Quarter("2023-Q1") == Quarter(2023, 1)
+        assert Quarter.parse("2023q4") == Quarter(2023, 4)
+
+    def test_init_InvalidQuarterThrowsValueError(self):
+        with pytest.raises(ValueError):
+            Quarter(2023, 5)
+        with pytest.raises(ValueError):
+            Quarter("2023-Q0")
+        with pytest.raises(ValueError):
+            Quarter("2023", 1)
+
+    def test_format_RoundTrips(self):
+        quarter = Quarter(2023, 2)
+        assert str(quarter) == "2023-Q2"
+        assert quarter.encoded == "2023-2"
+        assert Quarter(str(quarter)) == Quarter(quarter.encoded) == quarter
+
+    def test_quarter_IsImmutable(self):
+        with pytest.raises(AttributeError):
+            Quarter(2023, 1).year = 2024
+
+    def test_quarter_IsHashableAndOrdered(self):
+        quarters = [Quarter(2024, 1), Quarter(2023, 4), Quarter("2023-4")]
+        assert len(set(quarters)) == 2
+        assert sorted(quarters) == [
+            Quarter(2023, 4),
+            Quarter(2023, 4),
+            Quarter(2024, 1),
+        ]
+        assert {Quarter(2023, 4): 1}[Quarter("2023-Q4")] == 1
+
+    def test_arithmetic_WrapsYears(self):
+        assert Quarter(2023, 4) + 1 == Quarter(2024, 1)
+        assert Quarter(2024, 1) - 2 == Quarter(2023, 3)
+        assert Quarter(2024, 1) - Quarter(2022, 4) == 5
+
+    def test_range_IncludesBothEnds(self):
+        quarters = list(Quarter.range(Quarter(2023, 3), Quarter(2024, 1)))
+        assert [str(q) for q in quarters] == ["2023-Q3", "2023-Q4", "2024-Q1"]
+        assert list(Quarter.range(Quarter(2024, 1), Quarter(2023, 1))) == []
+
+    def test_pickle_RoundTrips(self):
+        assert pickle.loads(pickle.dumps(Quarter(2023, 2))) == Quarter(2023, 2)
+
+    def test_is_closed_AfterTheFollowingQuarter(self):
+        today = date(2024, 7, 1)
+        assert Quarter.current(today) == Quarter(2024, 3)
+        assert Quarter(2024, 1).is_closed(today)
+        assert not Quarter(2024, 2).is_closed(today)
+        assert quarter_is_closed(2024, 1, today)
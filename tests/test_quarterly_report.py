@@ -0,0 +1,181 @@
+import random
+import threading
+import time
+
+import pandas as pd
+
+from lcr.quarter import Quarter
+from lcr.quarterly_report import (
+    HistoricalQuarterlyReport,
+    QuarterlyReport,
+    QuarterlyReportColumns,
+)
+from lcr.unit import Unit
+from tests.conftest import report
+
+OPEN_QUARTER = Quarter.current()
+
+
+class FakeReportAPI:
+    """Serves a report per unit and quarter whose `members` value tells which version it is."""
+
+    def __init__(self, quarters, version=1, max_delay=0):
+        """
+        Args:
+            max_delay (float): Every call sleeps up to this many seconds, so concurrent calls
+                finish out of order.
+        """
+        self.quarters = quarters
+        self.version = version
+        self.max_delay = max_delay
+        self.requests = []
+        self._random = random.Random(1)
+        self._lock = threading.Lock()
+
+    def _sleep(self):
+        with self._lock:
+            delay = self._random.uniform(0, self.max_delay)
+        time.sleep(delay)
+
+    def available_report_quarters(self, unit):
+        self._sleep()
+        return list(self.quarters[unit.number])
+
+    def quarterly_report(self, unit_number, quarter, year):
+        self._sleep()
+        with self._lock:
+            self.requests.append((unit_number, Quarter(year, quarter)))
+        return report(
+            ("members", unit_number * 100 + self.version, None),
+            (f"q{quarter}", year, None),
+        )
+
+
+class TestQuarterlyReportColumns:
+    def test_to_frame_FlattensReports(self):
+        columns = QuarterlyReportColumns()
+        columns.add(Unit("Ward", 1), Quarter("2024-1"), report(("members", 100, None)))
+        columns.add(Unit("Ward", 1), Quarter("2024-2"), report(("attending", 5, 10)))
+        df = columns.to_frame()
+        assert list(df.columns) == [
+            "year",
+            "quarter.num",
+            "quarter",
+            "unitId",
+            "unitName",
+            "members",
+            "members.potential",
+            "attending",
+            "attending.potential",
+        ]
+        assert list(df["quarter"]) == ["2024-Q1", "2024-Q2"]
+        assert df["members"].dtype == "Int64"
+        assert df["members"].isna().tolist() == [False, True]
+        assert df["attending.potential"].tolist()[1] == 10
+
+    def test_to_frame_KeepsBooleansAndStrings(self):
+        columns = QuarterlyReportColumns()
+        columns.add(Unit("1234", 1), Quarter("2024-1"), report(("flag", True, 2.0)))
+        columns.add(Unit("5678", 1), Quarter("2024-2"), report(("flag", False, None)))
+        df = columns.to_frame()
+        assert df["unitName"].tolist() == ["1234", "5678"]
+        assert df["flag"].tolist() == [True, False]
+        assert df["flag.potential"].dtype == "Int64"
+
+    def test_to_frame_MatchesRowByRowFlattening(self):
+        reports = [
+            report(("a", 1, 2), ("b", 3, None)),
+            report(("b", 4, 5), ("c", 6, 7)),
+        ]
+        columns = QuarterlyReportColumns()
+        rows = []
+        for number, qrp in enumerate(reports, start=1):
+            columns.add(Unit("Ward", 1), Quarter(f"2024-{number}"), qrp)
+            row = {"year": 2024, "quarter.num": number}
+            row.update({"quarter": f"2024-Q{number}", "unitId": 1, "unitName": "Ward"})
+            for r in qrp["sections"][0]["rows"]:
+                row[r["nameResourceId"]] = r["actualValue"]
+                row[f"{r['nameResourceId']}.potential"] = r["potentialValue"]
+            rows.append(row)
+        expected = pd.DataFrame(rows)
+        actual = columns.to_frame()
+        assert list(actual.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(
+            actual.astype("float64", errors="ignore"),
+            expected.astype("float64", errors="ignore"),
+            check_dtype=False,
+        )
+
+
+class TestQuarterlyReport:
+    def test_lookups_UseSectionAndRowIds(self):
+        qrp = QuarterlyReport(report(("members", 100, None), ("attending", 5, 10)))
+        assert len(qrp) == 2
+        assert ("section", "members") in qrp
+        assert qrp.get("section", "attending") == (5, 10)
+        assert qrp.get("other", "attending") is None
+        assert qrp.actual("section", "members") == 100
+        assert qrp.potential("section", "attending") == 10
+        assert QuarterlyReport.of(qrp) is qrp
+
+    def test_values_MissingRowsAreNone(self):
+        qrp = QuarterlyReport(report(("members", 100, None)))
+        fields = [("section", "members"), ("section", "missing")]
+        assert qrp.values(fields) == {"members": 100, "missing": None}
+
+
+class TestHistoricalQuarterlyReport:
+    def test_incremental_FetchesOnlyNewAndOpenQuarters(self, tmp_path):
+        path = tmp_path / "report.csv"
+        first, second, gone = Unit("First", 1), Unit("Second", 2), Unit("Gone", 3)
+        api = FakeReportAPI(
+            {
+                1: [Quarter(2020, 1), OPEN_QUARTER],
+                2: [Quarter(2020, 1)],
+                3: [Quarter(2020, 1)],
+            }
+        )
+        HistoricalQuarterlyReport(api, []).download_historical_quarters(
+            [first, second, gone], path
+        )
+
+        api = FakeReportAPI(
+            {
+                1: [Quarter(2020, 1), Quarter(2020, 2), OPEN_QUARTER],
+                2: [Quarter(2020, 1), Quarter(2020, 2)],
+            },
+            version=2,
+        )
+        df = HistoricalQuarterlyReport(api, []).download_historical_quarters(
+            [first, second], path, incremental=True
+        )
+        assert api.requests == [
+            (1, Quarter(2020, 2)),
+            (1, OPEN_QUARTER),
+            (2, Quarter(2020, 2)),
+        ]
+        assert list(zip(df["unitId"], df["quarter"], df["members"])) == [
+            (1, "2020-Q1", 101),
+            (1, "2020-Q2", 102),
+            (1, str(OPEN_QUARTER), 102),
+            (2, "2020-Q1", 201),
+            (2, "2020-Q2", 202),
+            (3, "2020-Q1", 301),
+        ]
+
+    def test_concurrent_MatchesSerialDownload(self, tmp_path):
+        units = [Unit(f"Ward {number}", number) for number in range(1, 6)]
+        quarters = {
+            unit.number: list(
+                Quarter.range(Quarter(2022, 1) + unit.number, Quarter(2023, 4))
+            )
+            for unit in units
+        }
+        serial = HistoricalQuarterlyReport(
+            FakeReportAPI(quarters), []
+        ).download_historical_quarters(units, tmp_path / "serial.csv")
+        concurrent = HistoricalQuarterlyReport(
+            FakeReportAPI(quarters, max_delay=0.01), [], max_workers=8
+        ).download_historical_quarters(units, tmp_path / "concurrent.csv")
+        assert len(serial) == sum(len(q) for q in quarters.values())
+        assert concurrent.equals(serial)
@@ -0,0 +1,48 @@
+import pytest
+
+from lcr.records import Calling, Member, iter_callings, snake_case
+
+
+class TestRecords:
+    def test_snake_case(self):
+        assert (
+            snake_case("houseHoldMemberNameForList")
+            == "house_hold_member_name_for_list"
+        )
+        assert snake_case("mrn") == "mrn"
+
+    def test_from_dict_RoundTripsToDict(self):
+        member = {"legacyCmisId": 1, "unitName": "Ward", "unknownKey": [1]}
+        record = Member.from_dict(member)
+        assert record.legacy_cmis_id == 1
+        assert record.extra == {"unknownKey": [1]}
+        assert record.to_dict() == member
+
+    def test_from_dict_MissingKeysReadAsNone(self):
+        record = Member.from_dict({"legacyCmisId": 1, "age": None})
+        assert record.unit_name is None
+        assert record.to_dict() == {"legacyCmisId": 1, "age": None}
+        with pytest.raises(AttributeError):
+            record.not_a_field
+
+    def test_from_dict_InternsRepeatedStrings(self):
+        first = Member.from_dict({"unitName": "".join(["Wa", "rd"])})
+        second = Member.from_dict({"unitName": "".join(["W", "ard"])})
+        assert first.unit_name is second.unit_name
+
+    def test_records_HaveNoInstanceDict(self):
+        assert not hasattr(Member.from_dict({}), "__dict__")
+
+    def test_iter_callings_FlattensOrganizations(self):
+        organizations = [
+            {
+                "name": "Elders Quorum",
+                "callings": [{"memberId": 1, "position": "President"}],
+                "children": [{"name": "Teachers", "callings": [{"memberId": 2}]}],
+            }
+        ]
+        callings = [Calling.from_dict(c) for c in iter_callings(organizations)]
+        assert [(c.member_id, c.organization) for c in callings] == [
+            (1, "Elders Quorum"),
+            (2, "Teachers"),
+        ]
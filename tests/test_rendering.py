@@ -0,0 +1,129 @@
+import json
+import sys
+
+import plotly.graph_objects as go
+import pytest
+
+from analytics.rendering import (
+    DashboardRenderer,
+    ParallelRenderer,
+    SharedValues,
+    _script_json,
+)
+
+TITLES = ["Membership", "Attendance", "Youth"]
+
+
+def figure(title):
+    return go.Figure(
+        go.Bar(x=["2024-Q1", "2024-Q2"], y=[1, 2]), layout={"title": title}
+    )
+
+
+class TestParallelRenderer:
+    def test_close_WritesHtmlInQueueOrder(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        renderer = ParallelRenderer(max_workers=2, image_format=None)
+        for title in TITLES:
+            renderer.render(title, figure(title))
+        timings = renderer.close()
+        assert [timing.title for timing in timings] == TITLES
+        assert all(timing.image_seconds >= 0 for timing in timings)
+        for title in TITLES:
+            assert (tmp_path / "analytics" / "data" / f"{title}.html").exists()
+        assert not list((tmp_path / "analytics" / "data").glob("*.png"))
+        assert renderer.close() == []
+
+    def test_close_MissingKaleidoThrows(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "kaleido", None)
+        renderer = ParallelRenderer(image_format="png")
+        renderer.render("Membership", figure("Membership"))
+        with pytest.raises(ImportError, match="image_format=None"):
+            renderer.close()
+
+
+def script_value(page, name):
+    prefix = f"const {name} = "
+    line = next(line for line in page.splitlines() if line.startswith(prefix))
+    return json.loads(line[len(prefix) : -1])
+
+
+def shared_refs(value):
+    if isinstance(value, list):
+        for item in value:
+            yield from shared_refs(item)
+    elif isinstance(value, dict):
+        if "$shared" in value:
+            yield value["$shared"]
+        for item in value.values():
+            yield from shared_refs(item)
+
+
+class TestSharedValues:
+    def test_share_arrays_StoresRepeatedArraysOnce(self):
+        shared = SharedValues()
+        quarters = ["2024-Q1", "2024-Q2"]
+        first = shared.share_arrays(
+            {"x": list(quarters), "y": [1, 2], "name": "Ward 1"}
+        )
+        second = shared.share_arrays(
+            {"x": list(quarters), "y": [3, 4], "name": "Ward 2"}
+        )
+        assert first["x"] == second["x"]
+        assert first["y"] != second["y"]
+        assert first["name"] == "Ward 1"
+        assert shared.values == [quarters, [1, 2], [3, 4]]
+
+    def test_share_arrays_StoresEncodedArraysOnce(self):
+        shared = SharedValues()
+        encoded = {"dtype": "f8", "bdata": "AAAAAAAA8D8AAAAAAAAAQA=="}
+        first = shared.share_arrays({"y": dict(encoded), "marker": {"size": []}})
+        second = shared.share_arrays({"y": dict(encoded)})
+        assert first["y"] == second["y"] == {"$shared": 0}
+        assert first["marker"] == {"size": []}
+        assert shared.values == [encoded]
+
+
+class TestDashboardRenderer:
+    def test_close_IncludesPlotlyjsOnce(self, tmp_path):
+        path = tmp_path / "dashboard.html"
+        renderer = DashboardRenderer(path)
+        for title in TITLES:
+            renderer.render(title, figure(title))
+        timings = renderer.close()
+        page = path.read_text(encoding="utf-8")
+        assert [timing.title for timing in timings] == TITLES
+        assert page.count('<script type="text/javascript">') == 1
+        assert page.count("<script") == 2
+
+    def test_close_SharedReferencesExist(self, tmp_path):
+        path = tmp_path / "dashboard.html"
+        renderer = DashboardRenderer(path, include_plotlyjs="cdn")
+        for title in TITLES:
+            renderer.render(title, figure(title))
+        renderer.close()
+        page = path.read_text(encoding="utf-8")
+        shared = script_value(page, "shared")
+        figures = script_value(page, "figures")
+        assert len(figures) == len(TITLES)
+        refs = list(shared_refs(figures))
+        assert refs
+        assert all(0 <= ref < len(shared) for ref in refs)
+        assert not list(shared_refs(shared))
+        # The template and the quarter axis are shared by every figure.
+        assert len(shared) < len(refs)
+
+    def test_close_EscapesTitles(self, tmp_path):
+        title = "</script><script>alert(1)</script>"
+        path = tmp_path / "dashboard.html"
+        renderer = DashboardRenderer(path, title=title, include_plotlyjs="cdn")
+        renderer.render(title, figure(title))
+        renderer.close()
+        page = path.read_text(encoding="utf-8")
+        assert "alert(1)</script>" not in page
+        assert page.count("</script>") == 2
+        assert script_value(page, "figures")[0]["layout"]["title"]["text"] == title
+
+    def test_script_json_EscapesClosingTags(self):
+        assert "</" not in _script_json({"text": "</script>"})
+        assert json.loads(_script_json({"text": "</script>"})) == {"text": "</script>"}
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+import requests
+
+from lcr.api import API
+from lcr.replay import (
+    RecordingMissingError,
+    RecordingTransport,
+    ReplayTransport,
+    build_response,
+    save_recording,
+)
+from lcr.unit import Unit
+from tests.conftest import MEMBER_LIST, MEMBER_LIST_URL, UNIT_NUMBER
+
+
+def replay_api(directory, **kwargs):
+    return API.from_cookies(
+        {}, UNIT_NUMBER, transport=ReplayTransport(directory, **kwargs)
+    )
+
+
+class TestReplay:
+    def test_replay_ReturnsRecordedResponse(self, recordings):
+        assert replay_api(recordings).member_list() == MEMBER_LIST
+
+    def test_replay_StreamsRecordedResponse(self, recordings):
+        assert list(replay_api(recordings).iter_member_list()) == MEMBER_LIST
+
+    def test_replay_MissingRecordingThrows(self, recordings):
+        with pytest.raises(RecordingMissingError):
+            replay_api(recordings).recommend_status()
+
+    def test_replay_InjectedErrorsAreRaised(self, recordings):
+        api = replay_api(recordings, error_rate=1, max_retries=0)
+        with pytest.raises(requests.HTTPError):
+            api.member_list()
+
+    def test_replay_InjectedErrorsAreRetried(self, recordings):
+        api = replay_api(recordings, error_rate=0.5, seed=1, max_retries=20)
+        api.transport.backoff_factor = 0
+        assert api.member_list() == MEMBER_LIST
+
+    def test_record_SavedRecordingReplays(self, tmp_path):
+        class Session:
+            def get(self, url, params=None, **kwargs):
+                return build_response(url, 200, json.dumps(MEMBER_LIST).encode("utf-8"))
+
+        request = {"url": MEMBER_LIST_URL, "params": {"unitNumber": UNIT_NUMBER}}
+        RecordingTransport(tmp_path).get(Session(), dict(request), "member_list")
+        response = ReplayTransport(tmp_path).get(None, dict(request), "member_list")
+        assert response.json() == MEMBER_LIST
+
+    def test_for_units_ReturnsResultsByUnit(self, recordings):
+        other_unit = [{"legacyCmisId": 2, "nameListPreferredLocal": "Doe, John"}]
+        save_recording(
+            recordings,
+            "member_list",
+            MEMBER_LIST_URL,
+            {"lang": "eng", "unitNumber": 67890},
+            200,
+            json.dumps(other_unit).encode("utf-8"),
+        )
+        results = replay_api(recordings).for_units(
+            [Unit("First", UNIT_NUMBER), Unit("Second", 67890)]
+        )
+        assert results == {
+            UNIT_NUMBER: {"member_list": MEMBER_LIST},
+            67890: {"member_list": other_unit},
+        }
+
+    def test_for_units_UnknownEndpointThrowsValueError(self, recordings):
+        with pytest.raises(ValueError):
+            replay_api(recordings).for_units([UNIT_NUMBER], ["callings"])
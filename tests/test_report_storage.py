@@ -0,0 +1,90 @@
+import pandas as pd
+import pytest
+
+from lcr.quarter import Quarter
+from lcr.quarterly_report import QuarterlyReportColumns
+from lcr.report_storage import (
+    read_quarterly_report,
+    storage_format,
+    with_numpy_dtypes,
+    with_report_dtypes,
+    write_quarterly_report,
+)
+from lcr.unit import Unit
+from tests.conftest import report
+
+SUFFIXES = [".csv", ".parquet", ".feather"]
+
+
+def report_table(*quarters):
+    columns = QuarterlyReportColumns()
+    for number, quarter in enumerate(quarters):
+        columns.add(
+            Unit("Ward", 1),
+            Quarter(quarter),
+            report(("members", 100 + number, None), ("attending", None, 10)),
+        )
+    return columns.to_frame()
+
+
+def comparable(df):
+    """The table with the dtypes csv reads back, so every format compares equal."""
+    df = with_numpy_dtypes(df)
+    return df.astype({"quarter": str, "unitName": str})
+
+
+@pytest.fixture(params=SUFFIXES)
+def path(request, tmp_path):
+    if request.param != ".csv":
+        pytest.importorskip("pyarrow")
+    return tmp_path / f"report{request.param}"
+
+
+class TestReportStorage:
+    def test_storage_format_UnknownExtensionThrowsValueError(self):
+        assert storage_format("report.PARQUET") == "parquet"
+        with pytest.raises(ValueError):
+            storage_format("report.xlsx")
+
+    def test_write_quarterly_report_RoundTrips(self, path):
+        df = report_table("2024-1", "2024-2")
+        write_quarterly_report(df, path)
+        pd.testing.assert_frame_equal(
+            comparable(read_quarterly_report(path)), comparable(df)
+        )
+
+    def test_read_quarterly_report_OnlyRequestedColumns(self, path):
+        write_quarterly_report(report_table("2024-1"), path)
+        df = read_quarterly_report(path, columns=["attending.potential"])
+        assert list(df.columns) == [
+            "year",
+            "quarter.num",
+            "quarter",
+            "unitId",
+            "unitName",
+            "attending.potential",
+        ]
+
+    def test_write_quarterly_report_Appends(self, path):
+        write_quarterly_report(report_table("2024-1"), path)
+        write_quarterly_report(report_table("2024-2"), path, append=True)
+        df = read_quarterly_report(path)
+        assert list(df["quarter"].astype(str)) == ["2024-Q1", "2024-Q2"]
+        assert list(df["members"]) == [100, 100]
+
+    def test_with_report_dtypes(self):
+        df = with_numpy_dtypes(report_table("2024-2", "2024-1"))
+        df["ratio"] = [0.5, 1.0]
+        typed = with_report_dtypes(df)
+        assert typed["members"].dtype == "Int64"
+        assert typed["attending"].dtype == "Int64"
+        assert typed["ratio"].dtype == "float64"
+        assert list(typed["quarter"].cat.categories) == ["2024-Q1", "2024-Q2"]
+        assert typed["quarter"].cat.ordered
+        assert typed["unitName"].dtype == "category"
+
+    def test_with_numpy_dtypes(self):
+        df = with_numpy_dtypes(report_table("2024-1", "2024-2"))
+        assert df["members"].dtype == "int64"
+        assert df["attending"].dtype == "float64"
+        assert df["attending"].isna().all()
@@ -0,0 +1,134 @@
+import json
+import os
+import stat
+
+import pytest
+
+from lcr.api import API, LCR_DOMAIN
+from lcr.replay import ReplayTransport, save_recording
+from lcr.session import delete_session, load_session, save_session
+from tests.conftest import UNIT_NUMBER
+
+COOKIES = [
+    {"name": "appSession.0", "value": "abc", "expiry": 2000, "path": "/"},
+    {"name": "appSession.1", "value": "def"},
+]
+ACCESS_TABLE_URL = f"https://{LCR_DOMAIN}/services/access-table"
+
+
+def record_access_table(directory, status, content, content_type):
+    save_recording(
+        directory,
+        "session_check",
+        ACCESS_TABLE_URL,
+        {"lang": "eng"},
+        status,
+        content,
+        {"Content-Type": content_type},
+    )
+
+
+class TestSession:
+    def test_save_session_RoundTrips(self, tmp_path):
+        path = tmp_path / "session.json"
+        save_session(path, COOKIES)
+        assert load_session(path, now=1000) == {
+            "appSession.0": "abc",
+            "appSession.1": "def",
+        }
+
+    def test_load_session_ExpiredSessionIsNone(self, tmp_path):
+        path = tmp_path / "session.json"
+        save_session(path, COOKIES)
+        assert load_session(path, now=2000) is None
+
+    def test_load_session_MissingFileIsNone(self, tmp_path):
+        assert load_session(tmp_path / "missing.json") is None
+
+    def test_load_session_CorruptFileIsNone(self, tmp_path):
+        path = tmp_path / "session.json"
+        path.write_text("{not json")
+        assert load_session(path) is None
+        path.write_text('[{"value": "abc"}]')
+        assert load_session(path) is None
+        path.write_text("[1, 2]")
+        assert load_session(path) is None
+
+    def test_save_session_OnlyOwnerCanRead(self, tmp_path):
+        path = tmp_path / "session.json"
+        path.write_text("[]")
+        os.chmod(path, 0o644)
+        save_session(path, COOKIES)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    def test_delete_session(self, tmp_path):
+        path = tmp_path / "session.json"
+        save_session(path, COOKIES)
+        delete_session(path)
+        delete_session(path)
+        assert not path.exists()
+
+
+class TestSessionReuse:
+    @pytest.fixture
+    def session_file(self, tmp_path):
+        path = tmp_path / "session.json"
+        save_session(path, COOKIES[1:])
+        return path
+
+    @pytest.fixture
+    def logins(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            API, "_login", lambda api, user, password: calls.append((user, password))
+        )
+        return calls
+
+    def test_api_ValidSessionSkipsLogin(self, tmp_path, session_file, monkeypatch):
+        def fail(api, user, password):
+            raise AssertionError("logged in despite a valid session")
+
+        monkeypatch.setattr(API, "_login", fail)
+        record_access_table(tmp_path, 200, b"{}", "application/json")
+        api = API(
+            "user",
+            "password",
+            UNIT_NUMBER,
+            session_file=session_file,
+            transport=ReplayTransport(tmp_path),
+        )
+        assert api.session.cookies["appSession.1"] == "def"
+        assert session_file.exists()
+
+    @pytest.mark.parametrize(
+        "status,content,content_type",
+        [
+            (302, b"", "text/html"),
+            (200, b"<html>Sign in</html>", "text/html"),
+            (401, json.dumps({"error": "expired"}).encode("utf-8"), "application/json"),
+        ],
+    )
+    def test_api_InvalidSessionLogsIn(
+        self, tmp_path, session_file, logins, status, content, content_type
+    ):
+        record_access_table(tmp_path, status, content, content_type)
+        api = API(
+            "user",
+            "password",
+            UNIT_NUMBER,
+            session_file=session_file,
+            transport=ReplayTransport(tmp_path),
+        )
+        assert logins == [("user", "password")]
+        assert not session_file.exists()
+        assert "appSession.1" not in api.session.cookies
+
+    def test_api_MissingSessionLogsIn(self, tmp_path, logins):
+        API(
+            "user",
+            "password",
+            UNIT_NUMBER,
+            session_file=tmp_path / "session.json",
+            transport=ReplayTransport(tmp_path),
+        )
+        assert logins == [("user", "password")]
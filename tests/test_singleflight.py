@@ -0,0 +1,79 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lcr.api import API
+from lcr.replay import ReplayTransport
+from lcr.singleflight import SingleFlight
+from tests.conftest import MEMBER_LIST, UNIT_NUMBER
+
+
+def wait_for_coalesced(flight, count, timeout=5):
+    """Wait until `count` calls are waiting on the running one."""
+    deadline = time.monotonic() + timeout
+    while flight.stats()["coalesced"] < count:
+        if time.monotonic() > deadline:
+            pytest.fail(
+                f"{flight.stats()} did not coalesce {count} calls in {timeout}s"
+            )
+        time.sleep(0.001)
+
+
+class TestSingleFlight:
+    def test_do_CoalescesConcurrentCalls(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        runs = []
+
+        def slow():
+            runs.append(1)
+            started.set()
+            release.wait()
+            return object()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(flight.do, "key", slow)
+            assert started.wait(5)
+            others = [executor.submit(flight.do, "key", slow) for _ in range(3)]
+            wait_for_coalesced(flight, 3)
+            release.set()
+            results = [first.result()] + [f.result() for f in others]
+        assert len(runs) == 1
+        assert all(result is results[0] for result in results)
+        assert flight.stats() == {"calls": 1, "coalesced": 3}
+
+    def test_do_SharesExceptions(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        error = ValueError("failed")
+
+        def failing():
+            started.set()
+            release.wait()
+            raise error
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(flight.do, "key", failing)
+            assert started.wait(5)
+            others = [executor.submit(flight.do, "key", failing) for _ in range(3)]
+            wait_for_coalesced(flight, 3)
+            release.set()
+            errors = [future.exception(timeout=5) for future in [first] + others]
+        assert all(e is error for e in errors)
+        assert flight.stats() == {"calls": 1, "coalesced": 3}
+        # The failed call is forgotten, so the next one runs again.
+        assert flight.do("key", lambda: 1) == 1
+
+    def test_make_request_CoalescesIdenticalRequests(self, recordings):
+        transport = ReplayTransport(recordings, latency=0.2)
+        api = API.from_cookies({}, UNIT_NUMBER, transport=transport)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: api.member_list(), range(4)))
+        assert all(result == MEMBER_LIST for result in results)
+        stats = api.request_stats()
+        assert stats["calls"] + stats["coalesced"] == 4
+        assert stats["coalesced"] >= 1
@@ -0,0 +1,58 @@
+from datetime import date, datetime
+
+import pytest
+
+from lcr.snapshots import MemberSnapshotStore, diff_members
+
+JANE = {"legacyCmisId": 1, "name": "Doe, Jane", "age": 30}
+JOHN = {"legacyCmisId": 2, "name": "Doe, John", "age": 31, "email": "j@x"}
+JUNE = {"legacyCmisId": 3, "name": "Roe, June", "age": 12}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MemberSnapshotStore(tmp_path)
+    store.record([JANE, JOHN], datetime(2024, 1, 1))
+    store.record([JANE, {**JOHN, "age": 32}], datetime(2024, 2, 1))
+    store.record([{**JANE, "age": 31}, JUNE], datetime(2024, 3, 1))
+    return store
+
+
+class TestMemberSnapshotStore:
+    def test_diff_members_KeepsOnlyChangedFields(self):
+        old = {"1": JANE, "2": JOHN}
+        new = {"1": {**JANE, "age": 31}, "2": {**JOHN}, "3": JUNE}
+        del new["2"]["email"]
+        delta = diff_members(old, new, datetime(2024, 1, 1))
+        assert delta.added == {"3": JUNE}
+        assert delta.changed == {"1": {"age": 31}}
+        assert delta.dropped == {"2": ["email"]}
+        assert delta.removed == []
+
+    def test_record_UnchangedPollAddsNoDelta(self, tmp_path):
+        store = MemberSnapshotStore(tmp_path)
+        store.record([JANE], datetime(2024, 1, 1))
+        assert not store.record([JANE], datetime(2024, 1, 2))
+        assert list(store.deltas()) == []
+
+    def test_snapshot_ReconstructsPastPolls(self, store):
+        assert store.snapshot(date(2024, 1, 15)) == [JANE, JOHN]
+        assert store.snapshot(datetime(2024, 2, 1)) == [JANE, {**JOHN, "age": 32}]
+        assert store.snapshot() == [{**JANE, "age": 31}, JUNE]
+        assert store.snapshot("2024-03-02") == store.snapshot()
+
+    def test_snapshot_BeforeBaselineThrowsValueError(self, store):
+        with pytest.raises(ValueError):
+            store.snapshot(date(2023, 12, 31))
+
+    def test_changes_since_ReadsOnlyLaterDeltas(self, store):
+        (delta,) = store.changes_since(date(2024, 2, 15))
+        assert delta.added == {"3": JUNE}
+        assert delta.removed == ["2"]
+        assert delta.changed == {"1": {"age": 31}}
+        assert delta.member_ids == {"1", "2", "3"}
+        assert len(store.changes_since(date(2024, 1, 1))) == 2
+
+    def test_record_OutOfOrderPollThrowsValueError(self, store):
+        with pytest.raises(ValueError):
+            store.record([JANE], datetime(2024, 2, 15))
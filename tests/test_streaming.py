@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from lcr.streaming import iter_json_array
+
+RECORDS = [
+    {"id": 1, "name": 'Doe, "Jane"', "values": [1, 2.5e3, None, True]},
+    {"id": 2, "name": "Smith, José", "values": []},
+    123456789,
+    "text with ] and } and \\",
+]
+
+
+def chunks(document: str, size: int):
+    data = document.encode("utf-8")
+    return [data[start : start + size] for start in range(0, len(data), size)]
+
+
+class TestStreaming:
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 1024])
+    def test_iter_json_array_YieldsEveryElement(self, size):
+        records = iter_json_array(chunks(json.dumps(RECORDS), size))
+        assert list(records) == RECORDS
+
+    @pytest.mark.parametrize("size", [1, 5, 1024])
+    def test_iter_json_array_KeySkipsOtherMembers(self, size):
+        document = json.dumps(
+            {"other": [{"x": ']}\\"'}], "elders": RECORDS, "reliefSociety": [1]}
+        )
+        assert list(iter_json_array(chunks(document, size), "elders")) == RECORDS
+
+    def test_iter_json_array_EmptyArray(self):
+        assert list(iter_json_array(chunks("[ ]", 1))) == []
+
+    def test_iter_json_array_MissingKeyThrowsKeyError(self):
+        with pytest.raises(KeyError):
+            list(iter_json_array(chunks('{"elders": []}', 4), "reliefSociety"))
+
+    def test_iter_json_array_InvalidDocumentThrowsValueError(self):
+        with pytest.raises(ValueError):
+            list(iter_json_array(chunks('[{"id": 1} {"id": 2}]', 4)))
@@ -0,0 +1,98 @@
+import pytest
+import requests
+
+from lcr.replay import build_response
+from lcr.transport import RateLimiter, Transport, retry_after_seconds
+
+URL = "https://example.org/api"
+
+
+class FakeClock:
+    """Stands in for `time.monotonic` and `time.sleep`; sleeping only moves the clock."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr("lcr.transport.time.monotonic", clock.monotonic)
+    monkeypatch.setattr("lcr.transport.time.sleep", clock.sleep)
+    return clock
+
+
+class StubSession:
+    """Answers every `get` with the next outcome, a response or an exception to raise."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.requests = []
+
+    def get(self, **request):
+        self.requests.append(request)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class TestTransport:
+    def test_get_HonorsRetryAfter(self, clock):
+        session = StubSession(
+            build_response(URL, 429, b"", {"Retry-After": "7"}),
+            build_response(URL, 200, b"[]"),
+        )
+        response = Transport().get(session, {"url": URL})
+        assert response.status_code == 200
+        assert response.retries == 1
+        assert clock.sleeps == [7.0]
+
+    def test_get_ReturnsLastRetryStatusResponse(self, clock):
+        session = StubSession(*(build_response(URL, 503, b"") for _ in range(3)))
+        response = Transport(max_retries=2).get(session, {"url": URL})
+        assert response.status_code == 503
+        assert response.retries == 2
+
+    def test_get_ExhaustedRetriesThrow(self, clock):
+        session = StubSession(*(requests.ConnectionError() for _ in range(3)))
+        with pytest.raises(requests.ConnectionError):
+            Transport(max_retries=2, backoff_factor=1).get(session, {"url": URL})
+        assert len(session.requests) == 3
+        assert len(clock.sleeps) == 2
+        assert all(0 <= delay <= 2**retry for retry, delay in enumerate(clock.sleeps))
+
+    def test_get_DoesNotRetryClientErrors(self, clock):
+        session = StubSession(build_response(URL, 404, b""))
+        assert Transport().get(session, {"url": URL}).status_code == 404
+        assert clock.sleeps == []
+
+    def test_rate_limiter_SpacesRequests(self, clock):
+        session = StubSession(*(build_response(URL, 200, b"[]") for _ in range(5)))
+        transport = Transport(rate_limit=2, burst=2)
+        sent = []
+        for _ in range(5):
+            transport.get(session, {"url": URL})
+            sent.append(clock.now)
+        assert sent == [100.0, 100.0, 100.5, 101.0, 101.5]
+
+    def test_rate_limiter_InvalidArgumentsThrow(self):
+        with pytest.raises(ValueError):
+            RateLimiter(0)
+        with pytest.raises(ValueError):
+            RateLimiter(1, burst=0)
+
+    def test_retry_after_seconds(self):
+        assert retry_after_seconds(build_response(URL, 429, b"")) is None
+        response = build_response(URL, 429, b"", {"Retry-After": "-3"})
+        assert retry_after_seconds(response) == 0.0
+        response = build_response(URL, 429, b"", {"Retry-After": "soon"})
+        assert retry_after_seconds(response) is None
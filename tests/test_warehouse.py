@@ -0,0 +1,107 @@
+import pandas as pd
+import pytest
+
+from lcr.quarter import Quarter
+from lcr.quarterly_report import QuarterlyReportColumns
+from lcr.unit import Unit
+from lcr.warehouse import Warehouse
+from tests.conftest import report
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+    warehouse = Warehouse(tmp_path / "warehouse.sqlite")
+    warehouse.upsert_units([Unit("First", 1), Unit("Second", 2)])
+    warehouse.upsert_quarterly_reports(
+        [
+            (1, Quarter(2023, 4), report(("members", 100, None), ("attending", 5, 10))),
+            (1, Quarter(2024, 1), report(("members", 101, None), ("attending", 6, 10))),
+            (2, Quarter(2024, 1), report(("members", 200, None), ("attending", 7, 20))),
+        ]
+    )
+    return warehouse
+
+
+class TestWarehouse:
+    def test_quarterly_values_FiltersSlices(self, warehouse):
+        df = warehouse.quarterly_values(["members"], start=Quarter(2024, 1))
+        assert list(zip(df["unit_name"], df["actual"])) == [
+            ("First", 101),
+            ("Second", 200),
+        ]
+        df = warehouse.quarterly_values(unit_numbers=[1], end=Quarter(2023, 4))
+        assert list(df["resource_id"]) == ["members", "attending"]
+
+    def test_upsert_quarterly_reports_ReplacesValues(self, warehouse):
+        warehouse.upsert_quarterly_reports(
+            [(2, Quarter(2024, 1), report(("members", 201, None)))]
+        )
+        df = warehouse.quarterly_values(["members"], unit_numbers=[2])
+        assert list(df["actual"]) == [201]
+        assert (2, Quarter(2024, 1)) in warehouse.stored_quarters()
+
+    def test_upsert_quarterly_reports_RemovesMissingRows(self, warehouse):
+        warehouse.upsert_quarterly_reports(
+            [(2, Quarter(2024, 1), report(("members", 201, None)))]
+        )
+        df = warehouse.quarterly_values(unit_numbers=[2])
+        assert list(df["resource_id"]) == ["members"]
+        df = warehouse.quarterly_values(["attending"])
+        assert list(df["unit_number"]) == [1, 1]
+
+    def test_quarterly_values_WideMatchesReportTable(self, warehouse):
+        columns = QuarterlyReportColumns()
+        columns.add(
+            Unit("First", 1),
+            Quarter(2023, 4),
+            report(("members", 100, None), ("attending", 5, 10)),
+        )
+        columns.add(
+            Unit("First", 1),
+            Quarter(2024, 1),
+            report(("members", 101, None), ("attending", 6, 10)),
+        )
+        expected = columns.to_frame()
+        wide = warehouse.quarterly_values(unit_numbers=[1], wide=True)
+        assert list(wide.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(
+            wide.astype("float64", errors="ignore"),
+            expected.astype("float64", errors="ignore"),
+            check_dtype=False,
+        )
+
+    def test_upsert_members_ReplacesUnitMembers(self, warehouse):
+        jane = {"legacyCmisId": 1, "nameListPreferredLocal": "Doe, Jane", "sex": "F"}
+        john = {"legacyCmisId": 2, "nameListPreferredLocal": "Doe, John", "sex": "M"}
+        warehouse.upsert_members(1, [jane, john])
+        warehouse.upsert_members(1, [jane])
+        members = warehouse.members(1)
+        assert list(members["name"]) == ["Doe, Jane"]
+
+    def test_upsert_members_KeepsMembersOfEveryUnit(self, warehouse):
+        jane = {"legacyCmisId": 1, "nameListPreferredLocal": "Doe, Jane"}
+        warehouse.upsert_members(1, [jane])
+        warehouse.upsert_members(2, [jane])
+        warehouse.upsert_recommends(1, [{"id": 1, "recommendStatus": "ACTIVE"}])
+        warehouse.upsert_recommends(2, [{"id": 1, "recommendStatus": "ACTIVE"}])
+        assert list(warehouse.members()["unit_number"]) == [1, 2]
+        assert list(warehouse.recommends()["unit_number"]) == [1, 2]
+
+    def test_callings_FilterByOrganization(self, warehouse):
+        organizations = [
+            {
+                "name": "Bishopric",
+                "subOrgId": 10,
+                "callings": [{"positionId": 1, "memberId": 1, "position": "Bishop"}],
+                "children": [
+                    {
+                        "name": "Clerks",
+                        "subOrgId": 11,
+                        "callings": [{"positionId": 2, "position": "Ward Clerk"}],
+                    }
+                ],
+            }
+        ]
+        warehouse.upsert_callings(1, organizations)
+        assert list(warehouse.callings(1)["position"]) == ["Bishop", "Ward Clerk"]
+        assert list(warehouse.callings(organization="Clerks")["position_id"]) == [2]